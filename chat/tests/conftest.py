@@ -0,0 +1,8 @@
+from pytest_factoryboy import register
+
+from chat.factories import ChatMessageFactory
+from rooms.factories import RoomFactory
+
+# Register chat factories (UserFactory is registered in the root conftest)
+register(RoomFactory)
+register(ChatMessageFactory)
@@ -1,57 +1,86 @@
+import os
+
 import pytest
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, pre_save
 from django.test import Client
-from rest_framework.test import APIClient
-from channels.testing import WebsocketCommunicator
-from channels.routing import URLRouter
-from channels.auth import AuthMiddlewareStack
+from factory.django import mute_signals
 from pytest_factoryboy import register
 from faker import Faker
 
 from accounts.factories import UserFactory
-from status.factories import StatusFactory, UserStatusFactory
-from rooms.factories import RoomFactory, RoomMembershipFactory
+from rooms.factories import RoomFactory
 from events.factories import EventFactory, EventParticipantFactory
 from feed.factories import PostFactory, CommentFactory
-from pairing.factories import PairingRequestFactory, PairingMatchFactory
+from pairing.factories import PairingMatchFactory
 from chat.factories import ChatMessageFactory
-from icebreaker.factories import IcebreakerQuestionFactory
+from icebreaker.factories import IcebreakerSessionFactory
 
-# Register factories
+# Register factories shared by every app; app-specific factories are
+# registered in each app's tests/conftest.py so that running a single
+# app's tests only builds the fixtures it can use.
 register(UserFactory)
-register(StatusFactory)
-register(UserStatusFactory)
-register(RoomFactory)
-register(RoomMembershipFactory)
-register(EventFactory)
-register(EventParticipantFactory)
-register(PostFactory)
-register(CommentFactory)
-register(PairingRequestFactory)
-register(PairingMatchFactory)
-register(ChatMessageFactory)
-register(IcebreakerQuestionFactory)
 
 # Initialize Faker
 fake = Faker()
 
+def muted_signals():
+    """Silence model save signals while building fixture data."""
+    return mute_signals(pre_save, post_save)
+
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
-    """Enable database access for all tests."""
+    """Enable database access for all tests.
+
+    Each test runs inside a transaction that is rolled back on teardown.
+    Tests that need committed data should opt into
+    ``@pytest.mark.django_db(transaction=True)`` and use ``clean_database``.
+    """
     pass
 
+@pytest.fixture
+def clean_database(transactional_db):
+    """Truncate all tables after a transactional test.
+
+    An opt-in alias for ``transactional_db``, whose teardown already
+    flushes every table.
+    """
+
+def _flush_database():
+    """Truncate every Django table in the test database."""
+    from django.core.management.color import no_style
+    from django.db import connection
+    tables = connection.introspection.django_table_names(
+        only_existing=True, include_views=False
+    )
+    statements = connection.ops.sql_flush(
+        no_style(), tables, reset_sequences=False, allow_cascade=True
+    )
+    connection.ops.execute_sql_flush(statements)
+
 @pytest.fixture
 def api_client():
     """Return an API client."""
+    from rest_framework.test import APIClient
+    return APIClient()
+
+@pytest.fixture(scope='session')
+def session_api_client():
+    """Return an API client shared by every test in the process."""
+    from rest_framework.test import APIClient
     return APIClient()
 
 @pytest.fixture
-def authenticated_client(user):
+def authenticated_client(session_api_client, user):
     """Return an authenticated API client."""
-    client = APIClient()
-    client.force_authenticate(user=user)
-    return client
+    session_api_client.force_authenticate(user=user)
+    yield session_api_client
+    # Reset in memory; logout() would create and flush a database session
+    session_api_client.force_authenticate(user=None)
+    session_api_client.credentials()
+    session_api_client.cookies.clear()
+    session_api_client.defaults.clear()
 
 @pytest.fixture
 def web_client():
@@ -71,104 +100,192 @@ def admin_user():
 @pytest.fixture
 def websocket_client(application):
     """Return a WebSocket client."""
+    from channels.auth import AuthMiddlewareStack
+    from channels.routing import URLRouter
+    from channels.testing import WebsocketCommunicator
     return WebsocketCommunicator(
         AuthMiddlewareStack(URLRouter(application.routing)),
         "ws/testws/"
     )
 
+@pytest.fixture(scope='session')
+def frozen_db(django_db_setup, django_db_blocker):
+    """Database access for session-scoped fixtures.
+
+    Objects built through this blocker are committed once and shared by
+    every test. Each test still runs inside the ``db`` fixture's
+    transaction, so database mutations are rolled back; tests that mutate
+    the returned instances in Python should ``refresh_from_db()`` first.
+
+    Transactional tests flush every table on teardown, which would delete
+    the shared rows, so they may not request these fixtures (see
+    ``pytest_runtest_setup``). pytest-django runs transactional tests after
+    all ``db`` tests, so the rows survive until the last test that can use
+    them.
+    """
+    yield django_db_blocker
+    with django_db_blocker.unblock():
+        _flush_database()
+
+def _bulk_create_users(size):
+    """Create users with a single multi-row INSERT."""
+    User = get_user_model()
+    return User.objects.bulk_create(UserFactory.build_batch(size))
+
+@pytest.fixture(scope='session')
+def pooled_users(frozen_db):
+    """Create the committed users handed out by ``user_pool``."""
+    with frozen_db.unblock(), muted_signals():
+        return _bulk_create_users(5)
+
 @pytest.fixture
-def room_with_members(room_factory, user_factory):
+def user_pool(pooled_users):
+    """Share a few committed users across factories that don't need distinct users.
+
+    The pool is only filled for the duration of the requesting test, so
+    other tests keep getting a fresh user from each pooled factory.
+    """
+    from tests.factories import clear_user_pool, fill_user_pool
+    fill_user_pool(pooled_users)
+    yield pooled_users
+    clear_user_pool()
+
+@pytest.fixture(scope='session')
+def room_with_members(frozen_db):
     """Create a room with members."""
-    room = room_factory()
-    members = user_factory.create_batch(3)
-    room.members.add(*members)
+    with frozen_db.unblock(), muted_signals():
+        room = RoomFactory()
+        members = _bulk_create_users(3)
+        room.members.add(*members)
     return room, members
 
-@pytest.fixture
-def event_with_participants(event_factory, user_factory):
+@pytest.fixture(scope='session')
+def event_with_participants(frozen_db):
     """Create an event with participants."""
-    event = event_factory()
-    participants = user_factory.create_batch(3)
-    for participant in participants:
-        EventParticipantFactory(event=event, user=participant)
+    with frozen_db.unblock(), muted_signals():
+        event = EventFactory()
+        participants = _bulk_create_users(3)
+        EventParticipantFactory._meta.model.objects.bulk_create([
+            EventParticipantFactory.build(event=event, user=participant)
+            for participant in participants
+        ])
     return event, participants
 
-@pytest.fixture
-def post_with_comments(post_factory, comment_factory, user_factory):
+@pytest.fixture(scope='session')
+def post_with_comments(frozen_db):
     """Create a post with comments."""
-    post = post_factory()
-    comments = comment_factory.create_batch(3, post=post, author=user_factory())
+    with frozen_db.unblock(), muted_signals():
+        post = PostFactory()
+        comments = CommentFactory._meta.model.objects.bulk_create(
+            CommentFactory.build_batch(3, post=post, author=UserFactory())
+        )
     return post, comments
 
-@pytest.fixture
-def pairing_match_with_users(pairing_match_factory, user_factory):
+@pytest.fixture(scope='session')
+def pairing_match_with_users(frozen_db):
     """Create a pairing match with users."""
-    user1 = user_factory()
-    user2 = user_factory()
-    match = pairing_match_factory(request__user=user1, matched_user=user2)
+    with frozen_db.unblock(), muted_signals():
+        user1 = UserFactory()
+        user2 = UserFactory()
+        match = PairingMatchFactory(request__user=user1, matched_user=user2)
     return match, user1, user2
 
-@pytest.fixture
-def chat_message_with_reactions(chat_message_factory, user_factory):
+@pytest.fixture(scope='session')
+def chat_message_with_reactions(frozen_db):
     """Create a chat message with reactions."""
-    message = chat_message_factory()
-    reactors = user_factory.create_batch(3)
-    for reactor in reactors:
-        message.reactions.create(user=reactor, emoji='👍')
+    with frozen_db.unblock(), muted_signals():
+        message = ChatMessageFactory()
+        reactors = _bulk_create_users(3)
+        ChatReaction = message.reactions.model
+        ChatReaction.objects.bulk_create([
+            ChatReaction(message=message, user=reactor, emoji='👍')
+            for reactor in reactors
+        ])
     return message, reactors
 
-@pytest.fixture
-def icebreaker_session_with_responses(icebreaker_session_factory, user_factory):
+@pytest.fixture(scope='session')
+def icebreaker_session_with_responses(frozen_db):
     """Create an icebreaker session with responses."""
-    session = icebreaker_session_factory()
-    participants = user_factory.create_batch(3)
-    session.participants.add(*participants)
+    with frozen_db.unblock(), muted_signals():
+        session = IcebreakerSessionFactory()
+        participants = _bulk_create_users(3)
+        session.participants.add(*participants)
     return session, participants
 
+# Session fixtures whose committed rows a transactional flush would delete
+FROZEN_DATA_FIXTURES = frozenset({
+    'pooled_users',
+    'room_with_members',
+    'event_with_participants',
+    'post_with_comments',
+    'pairing_match_with_users',
+    'chat_message_with_reactions',
+    'icebreaker_session_with_responses',
+})
+
+def _is_transactional(item):
+    """Return True if the test runs in a flushed (non-rolled-back) database."""
+    if {'transactional_db', 'live_server', 'clean_database'} & set(item.fixturenames):
+        return True
+    marker = item.get_closest_marker('django_db')
+    if marker is None:
+        return False
+    transaction = marker.kwargs.get('transaction', marker.args[0] if marker.args else False)
+    return bool(transaction or marker.kwargs.get('reset_sequences'))
+
+def pytest_runtest_setup(item):
+    """Refuse to share session data with tests that flush the database."""
+    shared = FROZEN_DATA_FIXTURES & set(getattr(item, 'fixturenames', ()))
+    if shared and _is_transactional(item):
+        pytest.fail(
+            f"{item.nodeid} uses {', '.join(sorted(shared))}, whose session data "
+            "is deleted by transactional tests; build the data inside the test instead",
+            pytrace=False,
+        )
+
 # Test data generators
 @pytest.fixture
 def create_test_data():
     """Create a set of test data."""
+    @muted_signals()
     def _create_test_data(num_users=5, num_rooms=3, num_events=2):
-        users = UserFactory.create_batch(num_users)
+        users = _bulk_create_users(num_users)
         rooms = RoomFactory.create_batch(num_rooms)
         events = EventFactory.create_batch(num_events)
         return {'users': users, 'rooms': rooms, 'events': events}
     return _create_test_data
 
-# Mock external services
-@pytest.fixture
-def mock_redis(mocker):
-    """Mock Redis connection."""
-    return mocker.patch('django_redis.cache.RedisCache')
+# In-memory stand-ins for external services (installed in pytest_configure)
+@pytest.fixture(scope='session')
+def mock_redis():
+    """Return the in-memory cache that replaces Redis."""
+    from django.core.cache import caches
+    return caches['default']
 
-@pytest.fixture
-def mock_celery(mocker):
-    """Mock Celery tasks."""
-    return mocker.patch('celery.app.task.Task.delay')
-
-@pytest.fixture
-def mock_websocket(mocker):
-    """Mock WebSocket connection."""
-    return mocker.patch('channels.layers.get_channel_layer')
+@pytest.fixture(scope='session')
+def mock_websocket():
+    """Return the in-memory channel layer."""
+    from channels.layers import get_channel_layer
+    return get_channel_layer()
 
 # Test utilities
 @pytest.fixture
 def assert_no_database_queries():
     """Assert that no database queries are made."""
     from django.db import connection
-    initial_queries = len(connection.queries)
-    yield
-    final_queries = len(connection.queries)
-    assert initial_queries == final_queries, (
-        f"{final_queries - initial_queries} unexpected database queries"
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as context:
+        yield
+    assert len(context) == 0, (
+        f"{len(context)} unexpected database queries"
     )
 
 @pytest.fixture
 def temporary_media_root(tmpdir):
     """Create a temporary media root."""
-    settings.MEDIA_ROOT = str(tmpdir)
-    return settings.MEDIA_ROOT
+    from django.test import override_settings
+    with override_settings(MEDIA_ROOT=str(tmpdir)):
+        yield str(tmpdir)
 
 @pytest.fixture
 def temporary_file():
@@ -180,19 +297,43 @@ def temporary_file():
         yield f
 
 # Test environment setup
+# --reuse-db and --no-migrations come from pytest.ini addopts, so
+# --create-db and --migrations still override them from the command line.
 def pytest_configure():
     """Configure test environment."""
+    from tests.logging import configure_test_logging
+    configure_test_logging()
+
     settings.TESTING = True
     settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+    settings.CELERY_BROKER_URL = 'memory://'
+    settings.CELERY_RESULT_BACKEND = 'cache+memory://'
+    settings.CACHES['default']['BACKEND'] = (
+        'django.core.cache.backends.locmem.LocMemCache'
+    )
+    settings.CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
     settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.AUTH_PASSWORD_VALIDATORS = []
 
-# Cleanup after tests
-@pytest.fixture(autouse=True)
-def cleanup_test_data():
-    """Clean up test data after each test."""
-    yield
-    User = get_user_model()
-    User.objects.all().delete()
+    # Point at the tmpfs-backed database started by scripts/test-db.sh
+    test_db_host = os.environ.get('TEST_DB_HOST')
+    if test_db_host:
+        settings.DATABASES['default'].update({
+            'HOST': test_db_host,
+            'PORT': os.environ.get('TEST_DB_PORT', '5433'),
+        })
+
+    # Clone test databases from a prebuilt schema template
+    test_db_template = os.environ.get('TEST_DB_TEMPLATE')
+    if test_db_template:
+        settings.DATABASES['default'].setdefault('TEST', {})
+        settings.DATABASES['default']['TEST']['TEMPLATE'] = test_db_template
 
 # Error handling
 @pytest.fixture
@@ -207,13 +348,13 @@ def assert_raises_validation_error():
 def benchmark_database_queries():
     """Benchmark database queries."""
     from django.db import connection
+    from django.test.utils import CaptureQueriesContext
     from time import time
     
-    start_queries = len(connection.queries)
     start_time = time()
-    yield
+    with CaptureQueriesContext(connection) as context:
+        yield
     end_time = time()
-    end_queries = len(connection.queries)
     
-    print(f"\nQueries executed: {end_queries - start_queries}")
+    print(f"\nQueries executed: {len(context.captured_queries)}")
     print(f"Time taken: {end_time - start_time:.2f}s")
@@ -0,0 +1,7 @@
+from pytest_factoryboy import register
+
+from events.factories import EventFactory, EventParticipantFactory
+
+# Register events factories (UserFactory is registered in the root conftest)
+register(EventFactory)
+register(EventParticipantFactory)
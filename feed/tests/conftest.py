@@ -0,0 +1,7 @@
+from pytest_factoryboy import register
+
+from feed.factories import PostFactory, CommentFactory
+
+# Register feed factories (UserFactory is registered in the root conftest)
+register(PostFactory)
+register(CommentFactory)
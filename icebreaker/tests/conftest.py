@@ -0,0 +1,6 @@
+from pytest_factoryboy import register
+
+from icebreaker.factories import IcebreakerQuestionFactory
+
+# Register icebreaker factories (UserFactory is registered in the root conftest)
+register(IcebreakerQuestionFactory)
@@ -0,0 +1,7 @@
+from pytest_factoryboy import register
+
+from pairing.factories import PairingRequestFactory, PairingMatchFactory
+
+# Register pairing factories (UserFactory is registered in the root conftest)
+register(PairingRequestFactory)
+register(PairingMatchFactory)
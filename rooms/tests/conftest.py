@@ -0,0 +1,7 @@
+from pytest_factoryboy import register
+
+from rooms.factories import RoomFactory, RoomMembershipFactory
+
+# Register rooms factories (UserFactory is registered in the root conftest)
+register(RoomFactory)
+register(RoomMembershipFactory)
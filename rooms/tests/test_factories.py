@@ -0,0 +1,41 @@
+from tests.factories import ChatMessageFactory, RoomFactory, UserFactory
+
+def test_create_bulk_creates_missing_relation_once():
+    rooms = RoomFactory.create_bulk(3)
+
+    assert len(rooms) == 3
+    assert all(room.pk for room in rooms)
+    assert len({room.created_by_id for room in rooms}) == 1
+    assert rooms[0].created_by.pk is not None
+
+def test_create_bulk_passes_prefixed_overrides_to_relation():
+    rooms = RoomFactory.create_bulk(2, created_by__username='bulk_owner')
+
+    assert {room.created_by.username for room in rooms} == {'bulk_owner'}
+
+def test_create_bulk_uses_given_relation():
+    owner = UserFactory()
+
+    rooms = RoomFactory.create_bulk(2, created_by=owner)
+
+    assert {room.created_by_id for room in rooms} == {owner.pk}
+
+def test_create_bulk_resolves_nested_relations():
+    messages = ChatMessageFactory.create_bulk(2)
+
+    room = messages[0].room
+    assert room.pk is not None
+    assert room.created_by.pk is not None
+    assert len({message.sender_id for message in messages}) == 1
+
+def test_create_test_data_links_to_created_users():
+    from tests.helpers import create_test_data
+
+    data = create_test_data()
+
+    user_ids = {user.pk for user in data['users']}
+    assert len(user_ids) == 3
+    assert {room.created_by_id for room in data['rooms']} <= user_ids
+    assert {event.created_by_id for event in data['events']} <= user_ids
+    assert {post.author_id for post in data['posts']} <= user_ids
+    assert {message.room_id for message in data['messages']} == {data['rooms'][0].pk}
@@ -0,0 +1,51 @@
+#!/bin/bash
+
+# Start a throwaway PostgreSQL instance for the test suite.
+#
+# The data directory lives on tmpfs and durability is disabled
+# (fsync, synchronous_commit, full_page_writes), so factory INSERTs
+# never wait on disk flushes. Never point anything but tests at it.
+
+# Exit on error
+set -e
+
+CONTAINER_NAME="${TEST_DB_CONTAINER:-breaksphere-test-db}"
+TEST_DB_PORT="${TEST_DB_PORT:-5433}"
+
+if docker ps --format '{{.Names}}' | grep -q "^${CONTAINER_NAME}$"; then
+    echo "Test database is already running on port ${TEST_DB_PORT}"
+    exit 0
+fi
+
+echo "Starting tmpfs-backed test database on port ${TEST_DB_PORT}..."
+docker run -d --rm \
+    --name "${CONTAINER_NAME}" \
+    --tmpfs /var/lib/postgresql/data:rw \
+    -e PGDATA=/var/lib/postgresql/data \
+    -e POSTGRES_USER=postgres \
+    -e POSTGRES_PASSWORD=postgres \
+    -e POSTGRES_DB=breaksphere_test \
+    -p "${TEST_DB_PORT}:5432" \
+    postgres:14-alpine \
+    -c fsync=off \
+    -c synchronous_commit=off \
+    -c full_page_writes=off
+
+echo "Waiting for test database to be ready..."
+until docker exec "${CONTAINER_NAME}" pg_isready -U postgres > /dev/null 2>&1; do
+    sleep 1
+done
+
+# Build the schema once into a template database; each test database is
+# then created with CREATE DATABASE ... TEMPLATE, which copies pages instead
+# of replaying migrations.
+TEST_DB_TEMPLATE="${TEST_DB_TEMPLATE:-breaksphere_test_template}"
+echo "Building template database ${TEST_DB_TEMPLATE}..."
+docker exec "${CONTAINER_NAME}" createdb -U postgres "${TEST_DB_TEMPLATE}"
+POSTGRES_HOST=localhost \
+POSTGRES_PORT="${TEST_DB_PORT}" \
+POSTGRES_DB="${TEST_DB_TEMPLATE}" \
+    python manage.py migrate --noinput
+
+echo "Test database is up. Run tests with:"
+echo "  TEST_DB_HOST=localhost TEST_DB_PORT=${TEST_DB_PORT} TEST_DB_TEMPLATE=${TEST_DB_TEMPLATE} pytest"
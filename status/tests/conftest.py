@@ -0,0 +1,7 @@
+from pytest_factoryboy import register
+
+from status.factories import StatusFactory, UserStatusFactory
+
+# Register status factories (UserFactory is registered in the root conftest)
+register(StatusFactory)
+register(UserStatusFactory)
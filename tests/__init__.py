@@ -100,16 +100,19 @@ from .fixtures import (
     create_message_fixtures,
     create_all_fixtures,
     load_all_fixtures,
+    get_fixture,
 )
 from .helpers import (
     with_test_database,
     with_test_cache,
     with_test_celery,
     with_test_websocket,
+    with_test_env,
     mock_now,
     count_queries,
     temporary_media_root,
     create_test_image,
+    create_test_image_bytes,
     create_test_file,
     get_test_user,
     get_auth_client,
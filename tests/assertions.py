@@ -1,13 +1,46 @@
+import json
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Type, Union
 from unittest import TestCase
+from unittest.mock import patch
 
-from django.db import models
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, models
 from django.http import HttpResponse
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
+def _data_contains(data: Any, needle: Any) -> bool:
+    """Check whether needle is a key or value anywhere in nested data."""
+    if isinstance(data, (str, bytes)):
+        return needle in data
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if any(key == needle for key in current):
+                return True
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple)):
+            stack.extend(current)
+        if current == needle and (current is not data or not isinstance(data, (dict, list, tuple))):
+            return True
+    return False
+
+def _ensure_rendered(response: HttpResponse) -> None:
+    """Render a lazy template response before reading its content."""
+    if not getattr(response, 'is_rendered', True):
+        response.render()
+
+def _as_bytes(value: Union[str, bytes], charset: str) -> bytes:
+    """Encode a text needle so it can be searched in raw response bytes."""
+    if isinstance(value, str):
+        return value.encode(charset)
+    return value
+
 class CustomAssertionsMixin:
     """Custom assertions for testing Django applications."""
 
@@ -45,10 +78,14 @@ class CustomAssertionsMixin:
         self.assertEqual(response.status_code, status_code)
         if hasattr(response, 'data'):
             # DRF Response
-            self.assertIn(expected_data, response.data)
+            self.assertTrue(
+                _data_contains(response.data, expected_data),
+                f"Response data does not contain {expected_data!r}"
+            )
         else:
             # Django HttpResponse
-            self.assertIn(expected_data, response.content.decode())
+            _ensure_rendered(response)
+            self.assertIn(_as_bytes(expected_data, response.charset), response.content)
 
     def assertResponseNotContains(
         self: TestCase,
@@ -60,10 +97,14 @@ class CustomAssertionsMixin:
         self.assertEqual(response.status_code, status_code)
         if hasattr(response, 'data'):
             # DRF Response
-            self.assertNotIn(unexpected_data, response.data)
+            self.assertFalse(
+                _data_contains(response.data, unexpected_data),
+                f"Response data contains {unexpected_data!r}"
+            )
         else:
             # Django HttpResponse
-            self.assertNotIn(unexpected_data, response.content.decode())
+            _ensure_rendered(response)
+            self.assertNotIn(_as_bytes(unexpected_data, response.charset), response.content)
 
     def assertResponseKeys(
         self: TestCase,
@@ -137,7 +178,6 @@ class CustomAssertionsMixin:
         expected_value: Any
     ) -> None:
         """Assert that a cache key exists with expected value."""
-        from django.core.cache import cache
         cached_value = cache.get(key)
         self.assertEqual(
             cached_value,
@@ -150,7 +190,6 @@ class CustomAssertionsMixin:
         key: str
     ) -> None:
         """Assert that a cache key does not exist."""
-        from django.core.cache import cache
         self.assertIsNone(
             cache.get(key),
             f"Cache hit for key that should not exist: {key}"
@@ -163,7 +202,6 @@ class CustomAssertionsMixin:
         **expected_kwargs
     ) -> None:
         """Assert that a Celery task was called with expected arguments."""
-        from unittest.mock import patch
         with patch(f'celery.app.task.Task.delay') as mock_task:
             mock_task.assert_called_with(*expected_args, **expected_kwargs)
 
@@ -172,10 +210,11 @@ class CustomAssertionsMixin:
         path: str
     ) -> None:
         """Assert that a WebSocket connection can be established."""
-        from channels.testing import WebsocketCommunicator
-        from channels.routing import URLRouter
+        # channels is optional; only WebSocket assertions need it
         from channels.auth import AuthMiddlewareStack
-        
+        from channels.routing import URLRouter
+        from channels.testing import WebsocketCommunicator
+
         application = URLRouter([])  # Add your URL patterns
         communicator = WebsocketCommunicator(
             AuthMiddlewareStack(application),
@@ -196,7 +235,6 @@ class CustomAssertionsMixin:
         **kwargs
     ) -> None:
         """Assert that a callable raises a ValidationError with expected message."""
-        from django.core.exceptions import ValidationError
         with self.assertRaises(ValidationError) as cm:
             callable_obj(*args, **kwargs)
         self.assertIn(
@@ -213,10 +251,9 @@ class CustomAssertionsMixin:
         **kwargs
     ) -> None:
         """Assert that a callable executes expected number of queries."""
-        from django.db import connection, reset_queries
-        reset_queries()
-        callable_obj(*args, **kwargs)
-        actual_count = len(connection.queries)
+        with CaptureQueriesContext(connection) as context:
+            callable_obj(*args, **kwargs)
+        actual_count = len(context)
         self.assertEqual(
             actual_count,
             expected_count,
@@ -262,7 +299,6 @@ class CustomAssertionsMixin:
         status_code: int = 200
     ) -> None:
         """Assert that response is JSON with expected data."""
-        import json
         self.assertEqual(response.status_code, status_code)
         self.assertEqual(
             response['Content-Type'],
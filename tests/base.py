@@ -1,42 +1,50 @@
 from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
-from django.urls import reverse
 from rest_framework.test import APITestCase, APITransactionTestCase
 from channels.testing import WebsocketCommunicator
 from channels.routing import URLRouter
 from channels.auth import AuthMiddlewareStack
-import json
+import orjson
 import pytest
-from unittest.mock import Mock, patch
+
+from .helpers import cached_reverse
 
 User = get_user_model()
 
+def create_test_user(username='testuser', password='testpass123', **kwargs):
+    """Create a test user."""
+    return User.objects.create_user(
+        username=username,
+        email=f'{username}@example.com',
+        password=password,
+        **kwargs
+    )
+
 class BaseTestCase(TestCase):
     """
     Base test case for standard Django tests.
     """
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = cls.create_user()
+
     def setUp(self):
         super().setUp()
-        self.user = self.create_user()
         self.client.login(username=self.user.username, password='testpass123')
 
     @classmethod
     def create_user(cls, username='testuser', password='testpass123', **kwargs):
         """Create a test user."""
-        return User.objects.create_user(
-            username=username,
-            email=f'{username}@example.com',
-            password=password,
-            **kwargs
-        )
+        return create_test_user(username, password, **kwargs)
 
     def assert_object_exists(self, model_class, **kwargs):
         """Assert that an object exists with given attributes."""
-        self.assertTrue(model_class.objects.filter(**kwargs).exists())
+        self.assertTrue(model_class._default_manager.filter(**kwargs).exists())
 
     def assert_object_does_not_exist(self, model_class, **kwargs):
         """Assert that an object does not exist with given attributes."""
-        self.assertFalse(model_class.objects.filter(**kwargs).exists())
+        self.assertFalse(model_class._default_manager.filter(**kwargs).exists())
 
     def assert_response_contains(self, response, text):
         """Assert that response content contains text."""
@@ -49,25 +57,29 @@ class BaseTestCase(TestCase):
 class BaseAPITestCase(APITestCase):
     """
     Base test case for REST API tests.
+
+    Tests run inside a rolled-back transaction; subclasses that need real
+    commits should derive from ``BaseRealTransactionTestCase`` instead.
     """
+    serialized_rollback = False
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = cls.create_user()
+
     def setUp(self):
         super().setUp()
-        self.user = self.create_user()
         self.client.force_authenticate(user=self.user)
 
     @classmethod
     def create_user(cls, username='testuser', password='testpass123', **kwargs):
         """Create a test user."""
-        return User.objects.create_user(
-            username=username,
-            email=f'{username}@example.com',
-            password=password,
-            **kwargs
-        )
+        return create_test_user(username, password, **kwargs)
 
     def get_response_json(self, response):
         """Get JSON response content."""
-        return json.loads(response.content.decode())
+        return orjson.loads(response.content)
 
     def assert_status_code(self, response, expected_status):
         """Assert response status code."""
@@ -76,7 +88,8 @@ class BaseAPITestCase(APITestCase):
     def assert_response_keys(self, response, expected_keys):
         """Assert response JSON contains expected keys."""
         content = self.get_response_json(response)
-        self.assertTrue(all(key in content for key in expected_keys))
+        missing = set(expected_keys).difference(content)
+        self.assertFalse(missing, f"Missing keys: {sorted(missing)}")
 
     def assert_error_response(self, response, expected_error):
         """Assert error response content."""
@@ -87,24 +100,37 @@ class BaseAPITestCase(APITestCase):
 class BaseWebSocketTestCase(TestCase):
     """
     Base test case for WebSocket tests.
+
+    Subclasses list their routes in ``ws_urlpatterns``. Set
+    ``connect_on_setup = False`` for classes whose tests don't all need a
+    connection and call ``create_communicator`` only where needed.
     """
+    ws_urlpatterns = []
+    connect_on_setup = True
+
     async def setUp(self):
         super().setUp()
         self.user = await self.create_user_async()
-        self.communicator = await self.create_communicator()
+        self.communicator = None
+        if self.connect_on_setup:
+            self.communicator = await self.create_communicator()
 
     @classmethod
     async def create_user_async(cls, username='testuser', password='testpass123', **kwargs):
         """Create a test user asynchronously."""
         return await cls.create_user(username, password, **kwargs)
 
+    @classmethod
+    def _get_application(cls):
+        """Build the routed ASGI application once per test class."""
+        if '_ws_app' not in cls.__dict__:
+            cls._ws_app = AuthMiddlewareStack(URLRouter(cls.ws_urlpatterns))
+        return cls._ws_app
+
     async def create_communicator(self, path='/ws/test/'):
         """Create a WebSocket communicator."""
-        application = URLRouter([
-            # Add your WebSocket URL patterns here
-        ])
         communicator = WebsocketCommunicator(
-            AuthMiddlewareStack(application),
+            self._get_application(),
             path
         )
         connected, _ = await communicator.connect()
@@ -113,9 +139,15 @@ class BaseWebSocketTestCase(TestCase):
 
     async def tearDown(self):
         """Clean up after tests."""
-        await self.communicator.disconnect()
+        if self.communicator is not None:
+            await self.communicator.disconnect()
         await super().tearDown()
 
+    async def drain(self, timeout=0.01):
+        """Discard any messages already queued on the communicator."""
+        while not await self.communicator.receive_nothing(timeout=timeout):
+            await self.communicator.receive_output()
+
     async def send_json_to(self, data):
         """Send JSON data through WebSocket."""
         await self.communicator.send_json_to(data)
@@ -130,38 +162,134 @@ class BaseWebSocketTestCase(TestCase):
         response = await self.receive_json_from()
         self.assertEqual(response, expected_message)
 
+class TaskCallRecorder:
+    """
+    Lightweight stand-in for Mock that records Celery task calls.
+    """
+    __slots__ = ('calls',)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, task_name, args, kwargs):
+        self.calls.append((task_name, args, kwargs))
+
+    @property
+    def called(self):
+        return bool(self.calls)
+
+    def reset(self):
+        """Forget all recorded calls."""
+        self.calls.clear()
+
+    def assert_called_with(self, *args, **kwargs):
+        """Assert that the most recent task call used these arguments."""
+        if not self.calls:
+            raise AssertionError('Expected a task call, but no task was called')
+        _, last_args, last_kwargs = self.calls[-1]
+        if (last_args, last_kwargs) != (args, kwargs):
+            raise AssertionError(
+                f"Expected call with {args!r}, {kwargs!r}; "
+                f"got {last_args!r}, {last_kwargs!r}"
+            )
+
+    def assert_not_called(self):
+        """Assert that no task was called."""
+        if self.calls:
+            raise AssertionError(f"Expected no task calls, got {len(self.calls)}")
+
 class BaseCeleryTestCase(TestCase):
     """
     Base test case for Celery task tests.
+
+    Tasks run eagerly (CELERY_TASK_ALWAYS_EAGER) on the in-memory broker.
+    Every executed task is recorded by ``mock_task`` and listed in
+    ``captured_tasks`` as ``(task_name, args, kwargs)``.
     """
+    captured_tasks = []
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from celery.signals import task_prerun
+        cls.mock_task = TaskCallRecorder()
+        cls.captured_tasks = cls.mock_task.calls
+
+        # Eager tasks are never published, so record them as they start
+        def capture_task(sender=None, task=None, args=None, kwargs=None, **extra):
+            cls.mock_task(task.name, tuple(args or ()), dict(kwargs or {}))
+
+        cls._capture_task = capture_task
+        task_prerun.connect(capture_task, weak=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        from celery.signals import task_prerun
+        task_prerun.disconnect(cls._capture_task)
+        super().tearDownClass()
+
     def setUp(self):
         super().setUp()
-        self.mock_task = Mock()
-        self.patcher = patch('celery.app.task.Task.delay', self.mock_task)
-        self.patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests."""
-        self.patcher.stop()
-        super().tearDown()
+        self.mock_task.reset()
 
     def assert_task_called(self, task_name, *args, **kwargs):
         """Assert that a Celery task was called with specific arguments."""
         task_path = f'breaksphere.tasks.{task_name}'
-        self.mock_task.assert_called_with(*args, **kwargs)
+        calls = [
+            (call_args, call_kwargs)
+            for name, call_args, call_kwargs in self.captured_tasks
+            if name in (task_name, task_path)
+        ]
+        self.assertIn((args, kwargs), calls)
 
     def assert_task_not_called(self):
         """Assert that no Celery task was called."""
         self.mock_task.assert_not_called()
 
-class BaseTransactionTestCase(TransactionTestCase):
+class BaseTransactionTestCase(TestCase):
     """
     Base test case for database transaction tests.
+
+    Each test runs inside a transaction that is rolled back afterwards and
+    ``assert_atomic_operation`` uses a nested savepoint. Use
+    ``BaseRealTransactionTestCase`` only when a test needs data committed
+    and visible to other connections (threads, on_commit hooks, etc.).
+    """
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = cls.create_user()
+
+    @classmethod
+    def create_user(cls, username='testuser', password='testpass123', **kwargs):
+        """Create a test user."""
+        return create_test_user(username, password, **kwargs)
+
+    def assert_atomic_operation(self, callable_obj, *args, **kwargs):
+        """Assert that an operation is atomic."""
+        from django.db import transaction
+        try:
+            with transaction.atomic():
+                callable_obj(*args, **kwargs)
+        except Exception as e:
+            self.fail(f"Operation was not atomic: {str(e)}")
+
+class BaseRealTransactionTestCase(TransactionTestCase):
+    """
+    Base test case for tests that need real commits.
+
+    Tables are flushed between tests, which is much slower than the
+    rollback used by ``BaseTransactionTestCase``.
     """
     def setUp(self):
         super().setUp()
         self.user = self.create_user()
 
+    @classmethod
+    def create_user(cls, username='testuser', password='testpass123', **kwargs):
+        """Create a test user."""
+        return create_test_user(username, password, **kwargs)
+
     def assert_atomic_operation(self, callable_obj, *args, **kwargs):
         """Assert that an operation is atomic."""
         from django.db import transaction
@@ -175,11 +303,17 @@ class BasePermissionTestCase(APITestCase):
     """
     Base test case for permission tests.
     """
-    def setUp(self):
-        super().setUp()
-        self.admin_user = self.create_user(is_staff=True, is_superuser=True)
-        self.regular_user = self.create_user(username='regular')
-        self.unauthorized_user = self.create_user(username='unauthorized')
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin_user = cls.create_user(is_staff=True, is_superuser=True)
+        cls.regular_user = cls.create_user(username='regular')
+        cls.unauthorized_user = cls.create_user(username='unauthorized')
+
+    @classmethod
+    def create_user(cls, username='testuser', password='testpass123', **kwargs):
+        """Create a test user."""
+        return create_test_user(username, password, **kwargs)
 
     def assert_permission_required(self, url, method='get'):
         """Assert that a view requires authentication."""
@@ -197,9 +331,15 @@ class BaseFactoryTestCase(TestCase):
     """
     Base test case for factory tests.
     """
-    def setUp(self):
-        super().setUp()
-        self.user = self.create_user()
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = cls.create_user()
+
+    @classmethod
+    def create_user(cls, username='testuser', password='testpass123', **kwargs):
+        """Create a test user."""
+        return create_test_user(username, password, **kwargs)
 
     @classmethod
     def create_batch(cls, factory_class, size=3, **kwargs):
@@ -215,14 +355,23 @@ class BaseViewTestCase(TestCase):
     """
     Base test case for view tests.
     """
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = cls.create_user()
+
+    @classmethod
+    def create_user(cls, username='testuser', password='testpass123', **kwargs):
+        """Create a test user."""
+        return create_test_user(username, password, **kwargs)
+
     def setUp(self):
         super().setUp()
-        self.user = self.create_user()
         self.client.login(username=self.user.username, password='testpass123')
 
     def get_url(self, url_name, *args, **kwargs):
         """Get URL by name."""
-        return reverse(url_name, args=args, kwargs=kwargs)
+        return cached_reverse(url_name, *args, **kwargs)
 
     def assert_template_used(self, response, template_name):
         """Assert that a specific template was used."""
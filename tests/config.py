@@ -7,38 +7,53 @@ Configuration settings for the BreakSphere test suite.
 
 import os
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 # Base test directory
 TEST_DIR = Path(__file__).parent
 
 # Test data directory for fixtures and resources
 TEST_DATA_DIR = TEST_DIR / 'data'
-TEST_DATA_DIR.mkdir(exist_ok=True)
 
 # Test output directory for reports and logs
 TEST_OUTPUT_DIR = TEST_DIR / 'output'
-TEST_OUTPUT_DIR.mkdir(exist_ok=True)
 
 # Test media directory for uploaded files during tests
 TEST_MEDIA_DIR = TEST_OUTPUT_DIR / 'media'
-TEST_MEDIA_DIR.mkdir(exist_ok=True)
 
 # Test static directory for collected static files during tests
 TEST_STATIC_DIR = TEST_OUTPUT_DIR / 'static'
-TEST_STATIC_DIR.mkdir(exist_ok=True)
 
 # Test log directory
 TEST_LOG_DIR = TEST_OUTPUT_DIR / 'logs'
-TEST_LOG_DIR.mkdir(exist_ok=True)
 
 # Test report directory
 TEST_REPORT_DIR = TEST_OUTPUT_DIR / 'reports'
-TEST_REPORT_DIR.mkdir(exist_ok=True)
 
 # Test coverage directory
 TEST_COVERAGE_DIR = TEST_OUTPUT_DIR / 'coverage'
-TEST_COVERAGE_DIR.mkdir(exist_ok=True)
+
+ALL_TEST_DIRS = (
+    TEST_DATA_DIR,
+    TEST_OUTPUT_DIR,
+    TEST_MEDIA_DIR,
+    TEST_STATIC_DIR,
+    TEST_LOG_DIR,
+    TEST_REPORT_DIR,
+    TEST_COVERAGE_DIR,
+)
+
+_test_dirs_created = False
+
+def ensure_test_dirs() -> None:
+    """Create the test data and output directories once per process."""
+    global _test_dirs_created
+    if _test_dirs_created:
+        return
+    for directory in ALL_TEST_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+    _test_dirs_created = True
 
 # Test environment settings
 TEST_ENVIRONMENT = {
@@ -52,14 +67,28 @@ TEST_ENVIRONMENT = {
     'CELERY_RESULT_BACKEND': 'cache',
     'MEDIA_ROOT': str(TEST_MEDIA_DIR),
     'STATIC_ROOT': str(TEST_STATIC_DIR),
+    # Cheap hashing and no validators keep create_user fast in tests
+    'PASSWORD_HASHERS': ['django.contrib.auth.hashers.MD5PasswordHasher'],
+    'AUTH_PASSWORD_VALIDATORS': [],
 }
 
+# Number of parallel test workers
+TEST_PARALLEL_JOBS = int(os.getenv('TEST_PARALLEL_JOBS') or os.cpu_count() or 1)
+
 # Test database settings
 TEST_DATABASE = {
     'ENGINE': 'django.db.backends.sqlite3',
     'NAME': ':memory:',
+    'CONN_MAX_AGE': None,
 }
 
+# Django builds the test database from TEST['NAME']; give each pytest-xdist
+# worker its own named shared-cache in-memory database.
+if os.getenv('PYTEST_XDIST_WORKER'):
+    TEST_DATABASE['TEST'] = {
+        'NAME': f"file:testdb_{os.environ['PYTEST_XDIST_WORKER']}?mode=memory&cache=shared",
+    }
+
 # Test cache settings
 TEST_CACHE = {
     'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -110,7 +139,9 @@ TEST_REST_FRAMEWORK = {
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
-# Test logging settings
+# Test logging settings (set TEST_LOG_TO_FILE=1 to also write test.log)
+TEST_LOG_TO_FILE = os.getenv('TEST_LOG_TO_FILE', '0') == '1'
+
 TEST_LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -125,26 +156,33 @@ TEST_LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
-        'file': {
-            'class': 'logging.FileHandler',
-            'filename': str(TEST_LOG_DIR / 'test.log'),
-            'formatter': 'verbose',
-        },
     },
     'root': {
-        'handlers': ['console', 'file'],
+        'handlers': ['console'],
         'level': 'INFO',
     },
 }
 
+if TEST_LOG_TO_FILE:
+    TEST_LOGGING['handlers']['file'] = {
+        'class': 'logging.FileHandler',
+        'filename': str(TEST_LOG_DIR / 'test.log'),
+        'formatter': 'verbose',
+    }
+    TEST_LOGGING['root']['handlers'].append('file')
+
 # Test runner settings
 TEST_RUNNER = {
     'TEST_RUNNER': 'tests.runner.BreakSphereTestRunner',
-    'PARALLEL_TESTS': int(os.getenv('TEST_PARALLEL_JOBS', 1)),
+    'PARALLEL_TESTS': TEST_PARALLEL_JOBS,
     'RERUN_FAILED_TESTS': int(os.getenv('TEST_RERUN_COUNT', 0)),
     'RANDOM_ORDER': bool(os.getenv('TEST_RANDOM_ORDER', False)),
     'FAIL_FAST': bool(os.getenv('TEST_FAIL_FAST', False)),
     'SLOW_TEST_THRESHOLD': float(os.getenv('TEST_SLOW_THRESHOLD', 0.5)),
+    # Keep the test database between runs; set TEST_KEEPDB=0 or
+    # TEST_CREATE_DB=1 to rebuild it after migrations change.
+    'KEEPDB': os.getenv('TEST_KEEPDB', '1') != '0',
+    'CREATE_DB': os.getenv('TEST_CREATE_DB', '0') == '1',
 }
 
 # Test coverage settings
@@ -207,38 +245,9 @@ TEST_PATHS = {
 }
 
 # Combine all settings
-TEST_SETTINGS: Dict[str, Any] = {
-    **TEST_ENVIRONMENT,
-    'DATABASES': {'default': TEST_DATABASE},
-    'CACHES': {'default': TEST_CACHE},
-    'EMAIL': TEST_EMAIL,
-    'FILE_STORAGE': TEST_FILE_STORAGE,
-    'CELERY': TEST_CELERY,
-    'CHANNELS': TEST_CHANNELS,
-    'AUTH': TEST_AUTH,
-    'REST_FRAMEWORK': TEST_REST_FRAMEWORK,
-    'LOGGING': TEST_LOGGING,
-    'TEST_RUNNER': TEST_RUNNER,
-    'COVERAGE': TEST_COVERAGE,
-    'TIMEOUTS': TEST_TIMEOUTS,
-    'RATE_LIMITS': TEST_RATE_LIMITS,
-    'FEATURES': TEST_FEATURES,
-    'CONSTANTS': TEST_CONSTANTS,
-    'PATHS': TEST_PATHS,
-}
-
-def get_test_setting(key: str, default: Any = None) -> Any:
-    """Get a test setting by key."""
-    return TEST_SETTINGS.get(key, default)
-
-def update_test_setting(key: str, value: Any) -> None:
-    """Update a test setting."""
-    TEST_SETTINGS[key] = value
-
-def reset_test_settings() -> None:
-    """Reset test settings to defaults."""
-    global TEST_SETTINGS
-    TEST_SETTINGS = {
+def _build_settings() -> Dict[str, Any]:
+    """Merge the individual setting groups into a single dict."""
+    return {
         **TEST_ENVIRONMENT,
         'DATABASES': {'default': TEST_DATABASE},
         'CACHES': {'default': TEST_CACHE},
@@ -257,3 +266,21 @@ def reset_test_settings() -> None:
         'CONSTANTS': TEST_CONSTANTS,
         'PATHS': TEST_PATHS,
     }
+
+_TEST_SETTINGS: Dict[str, Any] = _build_settings()
+
+# Read-only live view; use update_test_setting/reset_test_settings to change it
+TEST_SETTINGS: Mapping[str, Any] = MappingProxyType(_TEST_SETTINGS)
+
+def get_test_setting(key: str, default: Any = None) -> Any:
+    """Get a test setting by key."""
+    return TEST_SETTINGS.get(key, default)
+
+def update_test_setting(key: str, value: Any) -> None:
+    """Update a test setting."""
+    _TEST_SETTINGS[key] = value
+
+def reset_test_settings() -> None:
+    """Reset test settings to defaults."""
+    _TEST_SETTINGS.clear()
+    _TEST_SETTINGS.update(_build_settings())
@@ -1,25 +1,56 @@
+import sys
 from datetime import timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Any
 
+@lru_cache(maxsize=1024)
+def _format_endpoint(template: str, params: tuple) -> str:
+    return str.format(template, **dict(params))
+
+class EndpointTemplate(str):
+    """
+    Endpoint path with placeholders, e.g. '/api/rooms/{id}/join/'.
+    Call it with the placeholder values to get a memoized formatted path;
+    it is still a plain str, so .format() keeps working.
+    """
+    __slots__ = ()
+
+    def __call__(self, **params: Any) -> str:
+        return _format_endpoint(self, tuple(sorted(params.items())))
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively turn dicts into read-only mappings and lists into tuples,
+    interning plain string keys and values along the way.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({freeze(k): freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
 # Test User Data
-TEST_USER_DATA = {
+TEST_USER_DATA = freeze({
     'username': 'testuser',
     'email': 'testuser@example.com',
     'password': 'testpass123',
     'first_name': 'Test',
     'last_name': 'User',
-}
+})
 
-TEST_ADMIN_DATA = {
+TEST_ADMIN_DATA = freeze({
     'username': 'admin',
     'email': 'admin@example.com',
     'password': 'adminpass123',
     'is_staff': True,
     'is_superuser': True,
-}
+})
 
 # Test Status Data
-TEST_STATUS_DATA = {
+TEST_STATUS_DATA = freeze({
     'available': {
         'name': 'Available',
         'code': 'available',
@@ -44,20 +75,20 @@ TEST_STATUS_DATA = {
         'priority': 60,
         'is_available': False,
     },
-}
+})
 
 # Test Room Data
-TEST_ROOM_DATA = {
+TEST_ROOM_DATA = freeze({
     'title': 'Test Room',
     'description': 'A test room for unit testing',
     'room_type': 'public',
     'icon_url': 'https://example.com/icon.png',
     'is_official': False,
     'max_members': 10,
-}
+})
 
 # Test Event Data
-TEST_EVENT_DATA = {
+TEST_EVENT_DATA = freeze({
     'title': 'Test Event',
     'description': 'A test event for unit testing',
     'event_type': 'social',
@@ -65,67 +96,67 @@ TEST_EVENT_DATA = {
     'is_virtual': True,
     'join_url': 'https://meet.example.com/test',
     'max_participants': 20,
-}
+})
 
 # Test Post Data
-TEST_POST_DATA = {
+TEST_POST_DATA = freeze({
     'content': 'This is a test post',
     'post_type': 'text',
     'visibility': 'public',
-}
+})
 
-TEST_POLL_DATA = {
+TEST_POLL_DATA = freeze({
     'content': 'Test poll question',
     'post_type': 'poll',
     'visibility': 'public',
     'options': ['Option 1', 'Option 2', 'Option 3'],
-}
+})
 
 # Test Chat Message Data
-TEST_MESSAGE_DATA = {
+TEST_MESSAGE_DATA = freeze({
     'content': 'Test message content',
     'message_type': 'text',
-}
+})
 
 # Test Icebreaker Data
-TEST_ICEBREAKER_DATA = {
+TEST_ICEBREAKER_DATA = freeze({
     'question_text': 'What is your favorite programming language?',
     'difficulty': 'easy',
-}
+})
 
 # Test Pairing Data
-TEST_PAIRING_DATA = {
+TEST_PAIRING_DATA = freeze({
     'preferred_duration': 30,
     'meeting_preference': 'video',
     'timezone_preference': 'exact',
-}
+})
 
 # Test File Data
-TEST_FILE_DATA = {
+TEST_FILE_DATA = freeze({
     'name': 'test_file.txt',
     'content': b'Test file content',
     'content_type': 'text/plain',
-}
+})
 
 # Test Image Data
-TEST_IMAGE_DATA = {
+TEST_IMAGE_DATA = freeze({
     'name': 'test_image.jpg',
     'content_type': 'image/jpeg',
     'width': 800,
     'height': 600,
-}
+})
 
 # Test Time Intervals
-TIME_INTERVALS = {
+TIME_INTERVALS = freeze({
     'MINUTE': timedelta(minutes=1),
     'HOUR': timedelta(hours=1),
     'DAY': timedelta(days=1),
     'WEEK': timedelta(weeks=1),
     'MONTH': timedelta(days=30),
-}
+})
 
 # Test API Endpoints
-API_ENDPOINTS = {
+API_ENDPOINTS = freeze({
     'auth': {
         'login': '/api/accounts/login/',
         'register': '/api/accounts/register/',
@@ -140,22 +171,22 @@ API_ENDPOINTS = {
     'rooms': {
         'list': '/api/rooms/',
         'create': '/api/rooms/create/',
-        'join': '/api/rooms/{id}/join/',
-        'leave': '/api/rooms/{id}/leave/',
+        'join': EndpointTemplate('/api/rooms/{id}/join/'),
+        'leave': EndpointTemplate('/api/rooms/{id}/leave/'),
     },
     'events': {
         'list': '/api/events/',
         'create': '/api/events/create/',
-        'rsvp': '/api/events/{id}/rsvp/',
+        'rsvp': EndpointTemplate('/api/events/{id}/rsvp/'),
     },
     'feed': {
         'list': '/api/feed/',
         'create': '/api/feed/create/',
-        'vote': '/api/feed/{id}/vote/',
+        'vote': EndpointTemplate('/api/feed/{id}/vote/'),
     },
     'chat': {
         'messages': '/api/chat/messages/',
-        'reactions': '/api/chat/messages/{id}/reactions/',
+        'reactions': EndpointTemplate('/api/chat/messages/{id}/reactions/'),
     },
     'pairing': {
         'request': '/api/pairing/request/',
@@ -165,17 +196,17 @@ API_ENDPOINTS = {
         'random': '/api/icebreaker/random/',
         'response': '/api/icebreaker/response/',
     },
-}
+})
 
 # Test WebSocket Endpoints
-WS_ENDPOINTS = {
-    'chat': 'ws/rooms/{room_id}/',
+WS_ENDPOINTS = freeze({
+    'chat': EndpointTemplate('ws/rooms/{room_id}/'),
     'notifications': 'ws/notifications/',
     'status': 'ws/status/',
-}
+})
 
 # Test Response Messages
-RESPONSE_MESSAGES = {
+RESPONSE_MESSAGES = freeze({
     'success': {
         'created': 'Resource created successfully',
         'updated': 'Resource updated successfully',
@@ -186,10 +217,10 @@ RESPONSE_MESSAGES = {
         'permission_denied': 'Permission denied',
         'validation_error': 'Validation error',
     },
-}
+})
 
 # Test Permissions
-TEST_PERMISSIONS = {
+TEST_PERMISSIONS = freeze({
     'admin': [
         'add_user',
         'change_user',
@@ -206,43 +237,43 @@ TEST_PERMISSIONS = {
         'send_message',
         'create_post',
     ],
-}
+})
 
 # Test Cache Keys
-CACHE_KEYS = {
+CACHE_KEYS = freeze({
     'user_status': 'user_status_{user_id}',
     'room_members': 'room_members_{room_id}',
     'event_participants': 'event_participants_{event_id}',
     'post_reactions': 'post_reactions_{post_id}',
-}
+})
 
 # Test Metrics
-TEST_METRICS = {
+TEST_METRICS = freeze({
     'response_time_threshold': 200,  # milliseconds
     'max_database_queries': 50,
     'cache_hit_ratio': 0.8,
-}
+})
 
 # Test Environment Variables
-TEST_ENV_VARS = {
+TEST_ENV_VARS = freeze({
     'DJANGO_SETTINGS_MODULE': 'breaksphere.settings_test',
     'DJANGO_DEBUG': 'False',
     'DJANGO_SECRET_KEY': 'test-secret-key',
     'POSTGRES_DB': 'breaksphere_test',
     'REDIS_URL': 'redis://localhost:6379/1',
-}
+})
 
 # Test Feature Flags
-TEST_FEATURES = {
+TEST_FEATURES = freeze({
     'ENABLE_WEBSOCKETS': True,
     'ENABLE_NOTIFICATIONS': True,
     'ENABLE_ANALYTICS': False,
     'ENABLE_CACHING': True,
-}
+})
 
 # Test Rate Limits
-RATE_LIMITS = {
+RATE_LIMITS = freeze({
     'login_attempts': '5/minute',
     'api_requests': '100/hour',
     'websocket_messages': '60/minute',
-}
+})
@@ -1,12 +1,19 @@
+import cProfile
 import functools
+import io
+import operator
 import os
+import pstats
+import tempfile
 import time
-from typing import Any, Callable, Optional, Type, Union
+from typing import Any, Callable, Optional, Tuple, Type, Union
+from unittest import SkipTest, skipIf
 from unittest.mock import patch
 
 from django.conf import settings
 from django.core.cache import cache
-from django.db import connection, reset_queries
+from django.db import connection
+from django.db.models import Q
 from django.test import override_settings, tag
 from django.utils import timezone
 
@@ -50,13 +57,44 @@ def skip_in_ci(test_func: Callable) -> Callable:
     Skip a test when running in CI environment.
     Usage: @skip_in_ci
     """
-    @functools.wraps(test_func)
-    def wrapper(*args, **kwargs):
-        if os.environ.get('CI'):
-            from unittest import skip
-            return skip('Test skipped in CI environment')(test_func)(*args, **kwargs)
-        return test_func(*args, **kwargs)
-    return wrapper
+    return skipIf(bool(os.environ.get('CI')), 'Test skipped in CI environment')(test_func)
+
+@functools.lru_cache(maxsize=1)
+def _redis_available() -> bool:
+    """Probe Redis once per process."""
+    try:
+        import redis
+    except ImportError:
+        return False
+    try:
+        redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=0
+        ).ping()
+    except redis.ConnectionError:
+        return False
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _celery_available() -> bool:
+    """Probe the Celery broker once per process."""
+    try:
+        from celery import current_app
+        current_app.connection().ensure_connection()
+    except Exception:
+        return False
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _channels_available() -> bool:
+    """Check once per process that Channels can be imported."""
+    try:
+        import channels
+        from channels.testing import WebsocketCommunicator
+    except ImportError:
+        return False
+    return True
 
 def requires_redis(test_func: Callable) -> Callable:
     """
@@ -65,17 +103,8 @@ def requires_redis(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        try:
-            import redis
-            client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=0
-            )
-            client.ping()
-        except (ImportError, redis.ConnectionError):
-            from unittest import skip
-            return skip('Redis is not available')(test_func)(*args, **kwargs)
+        if not _redis_available():
+            raise SkipTest('Redis is not available')
         return test_func(*args, **kwargs)
     return wrapper
 
@@ -86,12 +115,8 @@ def requires_celery(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        try:
-            from celery import current_app
-            current_app.connection().ensure_connection()
-        except Exception:
-            from unittest import skip
-            return skip('Celery is not available')(test_func)(*args, **kwargs)
+        if not _celery_available():
+            raise SkipTest('Celery is not available')
         return test_func(*args, **kwargs)
     return wrapper
 
@@ -102,12 +127,8 @@ def requires_channels(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        try:
-            import channels
-            from channels.testing import WebsocketCommunicator
-        except ImportError:
-            from unittest import skip
-            return skip('Channels is not available')(test_func)(*args, **kwargs)
+        if not _channels_available():
+            raise SkipTest('Channels is not available')
         return test_func(*args, **kwargs)
     return wrapper
 
@@ -118,10 +139,10 @@ def timer(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = test_func(*args, **kwargs)
-        end_time = time.time()
-        print(f"\n{test_func.__name__} took {end_time - start_time:.3f} seconds")
+        elapsed = time.perf_counter() - start_time
+        print(f"\n{test_func.__name__} took {elapsed:.3f} seconds")
         return result
     return wrapper
 
@@ -132,9 +153,15 @@ def count_queries(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        reset_queries()
-        result = test_func(*args, **kwargs)
-        query_count = len(connection.queries)
+        query_count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            result = test_func(*args, **kwargs)
         print(f"\n{test_func.__name__} made {query_count} queries")
         return result
     return wrapper
@@ -158,17 +185,18 @@ def freeze_time(timestamp: Union[str, timezone.datetime]) -> Callable:
     Freeze time during a test.
     Usage: @freeze_time('2024-01-01 12:00:00')
     """
+    if isinstance(timestamp, str):
+        frozen = timezone.datetime.strptime(
+            timestamp,
+            '%Y-%m-%d %H:%M:%S'
+        ).replace(tzinfo=timezone.utc)
+    else:
+        frozen = timestamp
+
     def decorator(test_func: Callable) -> Callable:
         @functools.wraps(test_func)
         def wrapper(*args, **kwargs):
-            with patch('django.utils.timezone.now') as mock_now:
-                if isinstance(timestamp, str):
-                    mock_now.return_value = timezone.datetime.strptime(
-                        timestamp,
-                        '%Y-%m-%d %H:%M:%S'
-                    ).replace(tzinfo=timezone.utc)
-                else:
-                    mock_now.return_value = timestamp
+            with patch('django.utils.timezone.now', return_value=frozen):
                 return test_func(*args, **kwargs)
         return wrapper
     return decorator
@@ -178,26 +206,53 @@ def with_permissions(*permissions: str) -> Callable:
     Add permissions to test user.
     Usage: @with_permissions('add_user', 'change_user')
     """
+    # The permission filter doesn't depend on the test, so build it once
+    pairs = {tuple(permission.split('.')) for permission in permissions}
+    query = functools.reduce(operator.or_, (
+        Q(content_type__app_label=app_label, codename=codename)
+        for app_label, codename in pairs
+    )) if pairs else None
+
     def decorator(test_func: Callable) -> Callable:
         @functools.wraps(test_func)
         def wrapper(self, *args, **kwargs):
             from django.contrib.auth.models import Permission
-            from django.contrib.contenttypes.models import ContentType
             
             user = getattr(self, 'user', None)
-            if user:
-                for permission in permissions:
-                    app_label, codename = permission.split('.')
-                    content_type = ContentType.objects.get(app_label=app_label)
-                    permission = Permission.objects.get(
-                        content_type=content_type,
-                        codename=codename
+            if user and pairs:
+                found = list(
+                    Permission.objects.filter(query)
+                    .values_list('pk', 'content_type__app_label', 'codename')
+                )
+                missing = pairs.difference(
+                    (app_label, codename) for _, app_label, codename in found
+                )
+                if missing:
+                    raise Permission.DoesNotExist(
+                        f"Unknown permissions: {sorted('.'.join(pair) for pair in missing)}"
                     )
-                    user.user_permissions.add(permission)
+                # One INSERT, without add()'s query for existing rows
+                through = type(user).user_permissions.through
+                through.objects.bulk_create(
+                    [through(user_id=user.pk, permission_id=pk) for pk, _, _ in found],
+                    ignore_conflicts=True
+                )
             return test_func(self, *args, **kwargs)
         return wrapper
     return decorator
 
+_session_media_root: Optional[tempfile.TemporaryDirectory] = None
+
+def get_session_media_root() -> str:
+    """
+    Return a temporary directory shared by the whole test process.
+    It is removed, with everything below it, when the process exits.
+    """
+    global _session_media_root
+    if _session_media_root is None:
+        _session_media_root = tempfile.TemporaryDirectory(prefix='test_media_')
+    return _session_media_root.name
+
 def with_media_root(test_func: Callable) -> Callable:
     """
     Use a temporary media root during a test.
@@ -205,20 +260,21 @@ def with_media_root(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        import tempfile
-        import shutil
-        temp_dir = tempfile.mkdtemp()
+        # Per-test subdirectory; cleanup happens once with the session root
+        temp_dir = tempfile.mkdtemp(dir=get_session_media_root())
         with override_settings(MEDIA_ROOT=temp_dir):
-            try:
-                return test_func(*args, **kwargs)
-            finally:
-                shutil.rmtree(temp_dir)
+            return test_func(*args, **kwargs)
     return wrapper
 
-def retry_on_failure(max_attempts: int = 3, delay: float = 1.0) -> Callable:
+def retry_on_failure(
+    max_attempts: int = 3,
+    delay: float = 1.0,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,)
+) -> Callable:
     """
-    Retry a test on failure.
-    Usage: @retry_on_failure(max_attempts=3, delay=1.0)
+    Retry a test on failure, doubling the delay after each attempt.
+    Only ``exceptions`` are retried; anything else is raised at once.
+    Usage: @retry_on_failure(max_attempts=3, delay=1.0, exceptions=(ConnectionError,))
     """
     def decorator(test_func: Callable) -> Callable:
         @functools.wraps(test_func)
@@ -226,11 +282,11 @@ def retry_on_failure(max_attempts: int = 3, delay: float = 1.0) -> Callable:
             for attempt in range(max_attempts):
                 try:
                     return test_func(*args, **kwargs)
-                except Exception as e:
+                except exceptions as e:
                     if attempt == max_attempts - 1:
                         raise
                     print(f"\nRetrying {test_func.__name__} after failure: {e}")
-                    time.sleep(delay)
+                    time.sleep(delay * (2 ** attempt))
         return wrapper
     return decorator
 
@@ -258,22 +314,23 @@ def benchmark(test_func: Callable) -> Callable:
     """
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
-        import cProfile
-        import pstats
-        import io
-        
         pr = cProfile.Profile()
+        failed = False
         pr.enable()
-        result = test_func(*args, **kwargs)
-        pr.disable()
-        
-        s = io.StringIO()
-        ps = pstats.Stats(pr, stream=s).sort_stats('cumulative')
-        ps.print_stats()
-        print(f"\nProfile for {test_func.__name__}:")
-        print(s.getvalue())
-        
-        return result
+        try:
+            return test_func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            pr.disable()
+            # Only pay for sorting and formatting when someone will read it
+            if failed or os.environ.get('PYTEST_PROFILE'):
+                s = io.StringIO()
+                ps = pstats.Stats(pr, stream=s).sort_stats(pstats.SortKey.CUMULATIVE)
+                ps.print_stats(25)
+                print(f"\nProfile for {test_func.__name__}:")
+                print(s.getvalue())
     return wrapper
 
 def require_debug(test_func: Callable) -> Callable:
@@ -284,8 +341,7 @@ def require_debug(test_func: Callable) -> Callable:
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
         if not settings.DEBUG:
-            from unittest import skip
-            return skip('Test requires DEBUG=True')(test_func)(*args, **kwargs)
+            raise SkipTest('Test requires DEBUG=True')
         return test_func(*args, **kwargs)
     return wrapper
 
@@ -297,7 +353,6 @@ def require_production(test_func: Callable) -> Callable:
     @functools.wraps(test_func)
     def wrapper(*args, **kwargs):
         if settings.DEBUG:
-            from unittest import skip
-            return skip('Test requires DEBUG=False')(test_func)(*args, **kwargs)
+            raise SkipTest('Test requires DEBUG=False')
         return test_func(*args, **kwargs)
     return wrapper
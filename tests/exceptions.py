@@ -1,297 +1,175 @@
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any
+
+_EMPTY_DEFAULTS = {'mapping': dict, 'list': list}
 
 class TestError(Exception):
-    """Base class for test exceptions."""
-    pass
+    """
+    Base class for test exceptions.
+
+    Subclasses list their extra constructor arguments in ``_FIELDS`` as
+    ``(name, template, kind)`` tuples, in positional order. ``kind`` is
+    ``required`` (always shown), ``optional`` (shown when truthy), ``set``
+    (shown when not None), ``mapping``/``list`` (shown as an indented
+    block) or ``text`` (shown verbatim under its label).
+    """
+    __slots__ = ()
+    _FIELDS = ()
+
+    def __init__(self, message: Any = '', *args: Any, **kwargs: Any):
+        if not self._FIELDS and not kwargs:
+            # No declared fields: accept any positional args, like Exception
+            super().__init__(message, *args)
+            return
+        names = [name for name, _, _ in self._FIELDS]
+        if len(args) > len(names):
+            raise TypeError(
+                f"{type(self).__name__} takes at most {len(names) + 1} positional arguments"
+            )
+        values = dict(zip(names, args))
+        for name, value in kwargs.items():
+            if name not in names or name in values:
+                raise TypeError(f"{type(self).__name__} got an unexpected argument '{name}'")
+            values[name] = value
+        for name, _, kind in self._FIELDS:
+            if name not in values and kind == 'required':
+                raise TypeError(f"{type(self).__name__} missing required argument '{name}'")
+            value = values.get(name)
+            if value is None and kind in _EMPTY_DEFAULTS:
+                value = _EMPTY_DEFAULTS[kind]()
+            setattr(self, name, value)
+        super().__init__(message)
+
+    def __reduce__(self):
+        # Slot values are not part of args, so pass them back positionally
+        values = tuple(getattr(self, name) for name, _, _ in self._FIELDS)
+        return type(self), (*self.args, *values)
+
+    def __str__(self) -> str:
+        # Details are only formatted when the exception is rendered
+        parts = [super().__str__()]
+        for name, template, kind in self._FIELDS:
+            value = getattr(self, name)
+            if kind == 'set':
+                shown = value is not None
+            else:
+                shown = kind == 'required' or bool(value)
+            if not shown:
+                continue
+            if kind == 'mapping':
+                parts.append(template)
+                parts.extend(f"  {key}: {item}" for key, item in value.items())
+            elif kind == 'list':
+                parts.append(template)
+                parts.extend(f"  - {item}" for item in value)
+            elif kind == 'text':
+                parts.append(template)
+                parts.append(value)
+            else:
+                parts.append(template.format(value))
+        return "\n".join(parts)
 
 class TestSetupError(TestError):
     """Exception raised when test setup fails."""
-    
-    def __init__(
-        self,
-        message: str,
-        setup_step: Optional[str] = None,
-        details: Optional[Dict[str, Any]] = None
-    ):
-        self.setup_step = setup_step
-        self.details = details or {}
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        if self.setup_step:
-            parts.append(f"Setup step: {self.setup_step}")
-        if self.details:
-            parts.append("Details:")
-            for key, value in self.details.items():
-                parts.append(f"  {key}: {value}")
-        return "\n".join(parts)
+    __slots__ = ('setup_step', 'details')
+    _FIELDS = (
+        ('setup_step', 'Setup step: {}', 'optional'),
+        ('details', 'Details:', 'mapping'),
+    )
 
 class TestTeardownError(TestError):
     """Exception raised when test teardown fails."""
-    
-    def __init__(
-        self,
-        message: str,
-        teardown_step: Optional[str] = None,
-        details: Optional[Dict[str, Any]] = None
-    ):
-        self.teardown_step = teardown_step
-        self.details = details or {}
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        if self.teardown_step:
-            parts.append(f"Teardown step: {self.teardown_step}")
-        if self.details:
-            parts.append("Details:")
-            for key, value in self.details.items():
-                parts.append(f"  {key}: {value}")
-        return "\n".join(parts)
+    __slots__ = ('teardown_step', 'details')
+    _FIELDS = (
+        ('teardown_step', 'Teardown step: {}', 'optional'),
+        ('details', 'Details:', 'mapping'),
+    )
 
 class TestDataError(TestError):
     """Exception raised when test data is invalid or missing."""
-    
-    def __init__(
-        self,
-        message: str,
-        data_type: Optional[str] = None,
-        expected: Optional[Any] = None,
-        actual: Optional[Any] = None
-    ):
-        self.data_type = data_type
-        self.expected = expected
-        self.actual = actual
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        if self.data_type:
-            parts.append(f"Data type: {self.data_type}")
-        if self.expected is not None:
-            parts.append(f"Expected: {self.expected}")
-        if self.actual is not None:
-            parts.append(f"Actual: {self.actual}")
-        return "\n".join(parts)
+    __slots__ = ('data_type', 'expected', 'actual')
+    _FIELDS = (
+        ('data_type', 'Data type: {}', 'optional'),
+        ('expected', 'Expected: {}', 'set'),
+        ('actual', 'Actual: {}', 'set'),
+    )
 
 class TestDependencyError(TestError):
     """Exception raised when a test dependency is missing."""
-    
-    def __init__(
-        self,
-        message: str,
-        dependency: str,
-        required_version: Optional[str] = None
-    ):
-        self.dependency = dependency
-        self.required_version = required_version
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Dependency: {self.dependency}")
-        if self.required_version:
-            parts.append(f"Required version: {self.required_version}")
-        return "\n".join(parts)
+    __slots__ = ('dependency', 'required_version')
+    _FIELDS = (
+        ('dependency', 'Dependency: {}', 'required'),
+        ('required_version', 'Required version: {}', 'optional'),
+    )
 
 class TestConfigurationError(TestError):
     """Exception raised when test configuration is invalid."""
-    
-    def __init__(
-        self,
-        message: str,
-        config_key: Optional[str] = None,
-        config_value: Optional[Any] = None
-    ):
-        self.config_key = config_key
-        self.config_value = config_value
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        if self.config_key:
-            parts.append(f"Configuration key: {self.config_key}")
-        if self.config_value is not None:
-            parts.append(f"Configuration value: {self.config_value}")
-        return "\n".join(parts)
+    __slots__ = ('config_key', 'config_value')
+    _FIELDS = (
+        ('config_key', 'Configuration key: {}', 'optional'),
+        ('config_value', 'Configuration value: {}', 'set'),
+    )
 
 class TestTimeoutError(TestError):
     """Exception raised when a test operation times out."""
-    
-    def __init__(
-        self,
-        message: str,
-        operation: str,
-        timeout: Union[int, float],
-        elapsed: Optional[Union[int, float]] = None
-    ):
-        self.operation = operation
-        self.timeout = timeout
-        self.elapsed = elapsed
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Operation: {self.operation}")
-        parts.append(f"Timeout: {self.timeout} seconds")
-        if self.elapsed is not None:
-            parts.append(f"Elapsed time: {self.elapsed} seconds")
-        return "\n".join(parts)
+    __slots__ = ('operation', 'timeout', 'elapsed')
+    _FIELDS = (
+        ('operation', 'Operation: {}', 'required'),
+        ('timeout', 'Timeout: {} seconds', 'required'),
+        ('elapsed', 'Elapsed time: {} seconds', 'set'),
+    )
 
 class TestAssertionError(TestError):
     """Exception raised when a test assertion fails."""
-    
-    def __init__(
-        self,
-        message: str,
-        assertion_type: str,
-        expected: Any,
-        actual: Any,
-        diff: Optional[str] = None
-    ):
-        self.assertion_type = assertion_type
-        self.expected = expected
-        self.actual = actual
-        self.diff = diff
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Assertion type: {self.assertion_type}")
-        parts.append(f"Expected: {self.expected}")
-        parts.append(f"Actual: {self.actual}")
-        if self.diff:
-            parts.append("Diff:")
-            parts.append(self.diff)
-        return "\n".join(parts)
+    __slots__ = ('assertion_type', 'expected', 'actual', 'diff')
+    _FIELDS = (
+        ('assertion_type', 'Assertion type: {}', 'required'),
+        ('expected', 'Expected: {}', 'required'),
+        ('actual', 'Actual: {}', 'required'),
+        ('diff', 'Diff:', 'text'),
+    )
 
 class TestEnvironmentError(TestError):
     """Exception raised when the test environment is invalid."""
-    
-    def __init__(
-        self,
-        message: str,
-        environment: str,
-        requirements: Optional[List[str]] = None
-    ):
-        self.environment = environment
-        self.requirements = requirements or []
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Environment: {self.environment}")
-        if self.requirements:
-            parts.append("Requirements:")
-            for req in self.requirements:
-                parts.append(f"  - {req}")
-        return "\n".join(parts)
+    __slots__ = ('environment', 'requirements')
+    _FIELDS = (
+        ('environment', 'Environment: {}', 'required'),
+        ('requirements', 'Requirements:', 'list'),
+    )
 
 class TestFixtureError(TestError):
     """Exception raised when a test fixture fails."""
-    
-    def __init__(
-        self,
-        message: str,
-        fixture_name: str,
-        fixture_type: Optional[str] = None,
-        cause: Optional[Exception] = None
-    ):
-        self.fixture_name = fixture_name
-        self.fixture_type = fixture_type
-        self.cause = cause
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Fixture name: {self.fixture_name}")
-        if self.fixture_type:
-            parts.append(f"Fixture type: {self.fixture_type}")
-        if self.cause:
-            parts.append(f"Cause: {str(self.cause)}")
-        return "\n".join(parts)
+    __slots__ = ('fixture_name', 'fixture_type', 'cause')
+    _FIELDS = (
+        ('fixture_name', 'Fixture name: {}', 'required'),
+        ('fixture_type', 'Fixture type: {}', 'optional'),
+        ('cause', 'Cause: {}', 'optional'),
+    )
 
 class TestCleanupError(TestError):
     """Exception raised when test cleanup fails."""
-    
-    def __init__(
-        self,
-        message: str,
-        cleanup_step: str,
-        resources: Optional[List[str]] = None,
-        cause: Optional[Exception] = None
-    ):
-        self.cleanup_step = cleanup_step
-        self.resources = resources or []
-        self.cause = cause
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Cleanup step: {self.cleanup_step}")
-        if self.resources:
-            parts.append("Resources:")
-            for resource in self.resources:
-                parts.append(f"  - {resource}")
-        if self.cause:
-            parts.append(f"Cause: {str(self.cause)}")
-        return "\n".join(parts)
+    __slots__ = ('cleanup_step', 'resources', 'cause')
+    _FIELDS = (
+        ('cleanup_step', 'Cleanup step: {}', 'required'),
+        ('resources', 'Resources:', 'list'),
+        ('cause', 'Cause: {}', 'optional'),
+    )
 
 class TestDatabaseError(TestError):
     """Exception raised when a database operation fails during testing."""
-    
-    def __init__(
-        self,
-        message: str,
-        operation: str,
-        model: Optional[str] = None,
-        query: Optional[str] = None,
-        cause: Optional[Exception] = None
-    ):
-        self.operation = operation
-        self.model = model
-        self.query = query
-        self.cause = cause
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Operation: {self.operation}")
-        if self.model:
-            parts.append(f"Model: {self.model}")
-        if self.query:
-            parts.append(f"Query: {self.query}")
-        if self.cause:
-            parts.append(f"Cause: {str(self.cause)}")
-        return "\n".join(parts)
+    __slots__ = ('operation', 'model', 'query', 'cause')
+    _FIELDS = (
+        ('operation', 'Operation: {}', 'required'),
+        ('model', 'Model: {}', 'optional'),
+        ('query', 'Query: {}', 'optional'),
+        ('cause', 'Cause: {}', 'optional'),
+    )
 
 class TestWebSocketError(TestError):
     """Exception raised when a WebSocket operation fails during testing."""
-    
-    def __init__(
-        self,
-        message: str,
-        operation: str,
-        connection_id: Optional[str] = None,
-        data: Optional[Dict[str, Any]] = None,
-        cause: Optional[Exception] = None
-    ):
-        self.operation = operation
-        self.connection_id = connection_id
-        self.data = data
-        self.cause = cause
-        super().__init__(self._format_message(message))
-
-    def _format_message(self, message: str) -> str:
-        parts = [message]
-        parts.append(f"Operation: {self.operation}")
-        if self.connection_id:
-            parts.append(f"Connection ID: {self.connection_id}")
-        if self.data:
-            parts.append("Data:")
-            for key, value in self.data.items():
-                parts.append(f"  {key}: {value}")
-        if self.cause:
-            parts.append(f"Cause: {str(self.cause)}")
-        return "\n".join(parts)
+    __slots__ = ('operation', 'connection_id', 'data', 'cause')
+    _FIELDS = (
+        ('operation', 'Operation: {}', 'required'),
+        ('connection_id', 'Connection ID: {}', 'optional'),
+        ('data', 'Data:', 'mapping'),
+        ('cause', 'Cause: {}', 'optional'),
+    )
@@ -1,3 +1,4 @@
+import itertools
 import random
 from datetime import timedelta
 from typing import Any, List, Optional
@@ -23,6 +24,47 @@ from status.models import Status, UserStatus
 
 fake = FakerClass()
 
+def _date_time_this_year():
+    # Calls the shared Faker directly, skipping factory_boy's provider lookup
+    return fake.date_time_this_year(tzinfo=timezone.utc)
+
+# Choices cycled through by factory.Iterator declarations
+_EVENT_TYPES = ('social', 'game', 'learning', 'wellness')
+_DIFFICULTIES = ('easy', 'medium', 'deep')
+_SESSION_TYPES = ('pairing', 'room', 'event')
+_ACHIEVEMENT_TYPES = ('break_streak', 'pairing', 'engagement')
+_STREAK_TYPES = ('daily_break', 'pairing', 'contribution')
+_EMOJIS = ('👍', '❤️', '😄', '🎉', '👏')
+_NOTIFICATION_TYPES = ('mention', 'reply', 'reaction')
+_MEETING_PREFERENCES = ('video', 'audio', 'chat', 'any')
+_TIMEZONE_PREFERENCES = ('exact', 'adjacent', 'any')
+_DURATIONS = (15, 30, 45, 60)
+_REACTION_TYPES = ('post', 'comment')
+
+class BulkCreateMixin:
+    """
+    Insert many instances with a few multi-row INSERTs.
+
+    Related objects that aren't passed in are created once and shared by
+    the whole batch. save() and post_generation hooks are not run, so only
+    use this on factories without them.
+    """
+    @classmethod
+    def create_bulk(cls, size: int, batch_size: int = 500, **kwargs: Any) -> List[Any]:
+        for name, declaration in cls._meta.declarations.items():
+            if isinstance(declaration, SubFactory) and name not in kwargs:
+                prefix = f'{name}__'
+                sub_kwargs = {
+                    key[len(prefix):]: kwargs.pop(key)
+                    for key in list(kwargs) if key.startswith(prefix)
+                }
+                # SubFactory keeps its own overrides in _defaults
+                kwargs[name] = declaration.get_factory().create(
+                    **{**declaration._defaults, **sub_kwargs}
+                )
+        objs = cls.build_batch(size, **kwargs)
+        return cls._meta.model.objects.bulk_create(objs, batch_size=batch_size)
+
 class UserFactory(DjangoModelFactory):
     class Meta:
         model = get_user_model()
@@ -31,9 +73,9 @@ class UserFactory(DjangoModelFactory):
     email = Faker('email')
     first_name = Faker('first_name')
     last_name = Faker('last_name')
-    password = factory.PostGenerationMethodCall('set_password', 'testpass123')
+    password = factory.django.Password('testpass123')
     is_active = True
-    date_joined = Faker('date_time_this_year', tzinfo=timezone.utc)
+    date_joined = LazyFunction(_date_time_this_year)
 
     @factory.post_generation
     def groups(self, create: bool, extracted: Optional[List[Any]], **kwargs):
@@ -43,6 +85,32 @@ class UserFactory(DjangoModelFactory):
             for group in extracted:
                 self.groups.add(group)
 
+# Users shared by factories whose tests don't depend on user identity.
+# Only filled while a test that requested the ``user_pool`` fixture runs.
+_USER_POOL: List[Any] = []
+_user_pool_index = itertools.count()
+
+def fill_user_pool(users: List[Any]) -> None:
+    """Make pooled factories reuse these users instead of creating new ones."""
+    global _user_pool_index
+    _USER_POOL[:] = users
+    _user_pool_index = itertools.count()
+
+def clear_user_pool() -> None:
+    """Go back to creating a fresh user per pooled factory call."""
+    _USER_POOL.clear()
+
+def _next_pooled_user() -> Any:
+    return _USER_POOL[next(_user_pool_index) % len(_USER_POOL)]
+
+def pooled_user() -> factory.Maybe:
+    """Take users round-robin from the pool, or build one when it's empty."""
+    return factory.Maybe(
+        LazyFunction(lambda: bool(_USER_POOL)),
+        yes_declaration=LazyFunction(_next_pooled_user),
+        no_declaration=SubFactory(UserFactory),
+    )
+
 class StatusFactory(DjangoModelFactory):
     class Meta:
         model = Status
@@ -58,13 +126,13 @@ class UserStatusFactory(DjangoModelFactory):
     class Meta:
         model = UserStatus
 
-    user = SubFactory(UserFactory)
+    user = pooled_user()
     status = SubFactory(StatusFactory)
     custom_message = Faker('sentence')
-    started_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    started_at = LazyFunction(_date_time_this_year)
     is_current = True
 
-class RoomFactory(DjangoModelFactory):
+class RoomFactory(BulkCreateMixin, DjangoModelFactory):
     class Meta:
         model = Room
 
@@ -74,24 +142,24 @@ class RoomFactory(DjangoModelFactory):
     icon_url = Faker('image_url')
     is_official = False
     created_by = SubFactory(UserFactory)
-    max_members = random.randint(5, 50)
+    max_members = LazyFunction(lambda: random.randint(5, 50))
 
 class RoomMembershipFactory(DjangoModelFactory):
     class Meta:
         model = RoomMembership
 
-    user = SubFactory(UserFactory)
+    user = pooled_user()
     room = SubFactory(RoomFactory)
     role = 'member'
-    joined_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    joined_at = LazyFunction(_date_time_this_year)
 
-class EventFactory(DjangoModelFactory):
+class EventFactory(BulkCreateMixin, DjangoModelFactory):
     class Meta:
         model = Event
 
     title = Faker('sentence')
     description = Faker('paragraph')
-    event_type = factory.Iterator(['social', 'game', 'learning', 'wellness'])
+    event_type = factory.Iterator(_EVENT_TYPES)
     start_time = LazyFunction(lambda: timezone.now() + timedelta(days=1))
     end_time = LazyFunction(lambda: timezone.now() + timedelta(days=1, hours=2))
     location = Faker('address')
@@ -104,11 +172,11 @@ class EventParticipantFactory(DjangoModelFactory):
         model = EventParticipant
 
     event = SubFactory(EventFactory)
-    user = SubFactory(UserFactory)
+    user = pooled_user()
     rsvp_status = 'yes'
     reminder_enabled = True
 
-class PostFactory(DjangoModelFactory):
+class PostFactory(BulkCreateMixin, DjangoModelFactory):
     class Meta:
         model = Post
 
@@ -116,7 +184,7 @@ class PostFactory(DjangoModelFactory):
     content = Faker('paragraph')
     post_type = 'text'
     visibility = 'public'
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
 
 class PollOptionFactory(DjangoModelFactory):
     class Meta:
@@ -126,16 +194,16 @@ class PollOptionFactory(DjangoModelFactory):
     text = Faker('sentence')
     order = factory.Sequence(lambda n: n)
 
-class CommentFactory(DjangoModelFactory):
+class CommentFactory(BulkCreateMixin, DjangoModelFactory):
     class Meta:
         model = Comment
 
     post = SubFactory(PostFactory)
     author = SubFactory(UserFactory)
     content = Faker('paragraph')
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
 
-class ChatMessageFactory(DjangoModelFactory):
+class ChatMessageFactory(BulkCreateMixin, DjangoModelFactory):
     class Meta:
         model = ChatMessage
 
@@ -143,7 +211,7 @@ class ChatMessageFactory(DjangoModelFactory):
     sender = SubFactory(UserFactory)
     content = Faker('paragraph')
     message_type = 'text'
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
 
 class PairingRequestFactory(DjangoModelFactory):
     class Meta:
@@ -151,7 +219,7 @@ class PairingRequestFactory(DjangoModelFactory):
 
     user = SubFactory(UserFactory)
     status = 'pending'
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
     expires_at = LazyAttribute(lambda o: o.created_at + timedelta(minutes=30))
 
 class PairingMatchFactory(DjangoModelFactory):
@@ -179,15 +247,15 @@ class IcebreakerQuestionFactory(DjangoModelFactory):
 
     category = SubFactory(IcebreakerCategoryFactory)
     question_text = Faker('sentence')
-    difficulty = factory.Iterator(['easy', 'medium', 'deep'])
+    difficulty = factory.Iterator(_DIFFICULTIES)
     created_by = SubFactory(UserFactory)
 
 class IcebreakerSessionFactory(DjangoModelFactory):
     class Meta:
         model = IcebreakerSession
 
-    session_type = factory.Iterator(['pairing', 'room', 'event'])
-    started_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    session_type = factory.Iterator(_SESSION_TYPES)
+    started_at = LazyFunction(_date_time_this_year)
     is_active = True
 
     @factory.post_generation
@@ -203,12 +271,12 @@ class UserAchievementFactory(DjangoModelFactory):
         model = UserAchievement
 
     user = SubFactory(UserFactory)
-    achievement_type = factory.Iterator(['break_streak', 'pairing', 'engagement'])
+    achievement_type = factory.Iterator(_ACHIEVEMENT_TYPES)
     title = Faker('sentence')
     description = Faker('paragraph')
     icon = 'fa-trophy'
     level = factory.Sequence(lambda n: n + 1)
-    progress = random.randint(0, 100)
+    progress = LazyFunction(lambda: random.randint(0, 100))
     target = 100
 
 class UserConnectionFactory(DjangoModelFactory):
@@ -218,36 +286,36 @@ class UserConnectionFactory(DjangoModelFactory):
     requester = SubFactory(UserFactory)
     receiver = SubFactory(UserFactory)
     status = 'pending'
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
 
 class UserStreakFactory(DjangoModelFactory):
     class Meta:
         model = UserStreak
 
     user = SubFactory(UserFactory)
-    streak_type = factory.Iterator(['daily_break', 'pairing', 'contribution'])
-    current_streak = random.randint(1, 30)
+    streak_type = factory.Iterator(_STREAK_TYPES)
+    current_streak = LazyFunction(lambda: random.randint(1, 30))
     longest_streak = LazyAttribute(lambda o: max(o.current_streak, random.randint(30, 60)))
-    last_activity = Faker('date_time_this_year', tzinfo=timezone.utc)
+    last_activity = LazyFunction(_date_time_this_year)
 
 class ChatReactionFactory(DjangoModelFactory):
     class Meta:
         model = ChatReaction
 
     message = SubFactory(ChatMessageFactory)
-    user = SubFactory(UserFactory)
-    emoji = factory.Iterator(['👍', '❤️', '😄', '🎉', '👏'])
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    user = pooled_user()
+    emoji = factory.Iterator(_EMOJIS)
+    created_at = LazyFunction(_date_time_this_year)
 
 class ChatNotificationFactory(DjangoModelFactory):
     class Meta:
         model = ChatNotification
 
-    user = SubFactory(UserFactory)
+    user = pooled_user()
     message = SubFactory(ChatMessageFactory)
-    notification_type = factory.Iterator(['mention', 'reply', 'reaction'])
+    notification_type = factory.Iterator(_NOTIFICATION_TYPES)
     is_read = False
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
 
 class EventReminderFactory(DjangoModelFactory):
     class Meta:
@@ -256,18 +324,18 @@ class EventReminderFactory(DjangoModelFactory):
     participant = SubFactory(EventParticipantFactory)
     reminder_time = LazyFunction(lambda: timezone.now() + timedelta(minutes=15))
     sent = False
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    created_at = LazyFunction(_date_time_this_year)
 
 class PairingPreferenceFactory(DjangoModelFactory):
     class Meta:
         model = PairingPreference
 
     user = SubFactory(UserFactory)
-    meeting_preference = factory.Iterator(['video', 'audio', 'chat', 'any'])
-    timezone_preference = factory.Iterator(['exact', 'adjacent', 'any'])
-    preferred_duration = factory.Iterator([15, 30, 45, 60])
+    meeting_preference = factory.Iterator(_MEETING_PREFERENCES)
+    timezone_preference = factory.Iterator(_TIMEZONE_PREFERENCES)
+    preferred_duration = factory.Iterator(_DURATIONS)
     is_active = True
-    last_updated = Faker('date_time_this_year', tzinfo=timezone.utc)
+    last_updated = LazyFunction(_date_time_this_year)
 
     @factory.post_generation
     def interests(self, create, extracted, **kwargs):
@@ -282,9 +350,9 @@ class ReactionFactory(DjangoModelFactory):
         model = Reaction
 
     user = SubFactory(UserFactory)
-    emoji = factory.Iterator(['👍', '❤️', '😄', '🎉', '👏'])
-    reaction_type = factory.Iterator(['post', 'comment'])
-    created_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    emoji = factory.Iterator(_EMOJIS)
+    reaction_type = factory.Iterator(_REACTION_TYPES)
+    created_at = LazyFunction(_date_time_this_year)
 
     @factory.post_generation
     def target(self, create, extracted, **kwargs):
@@ -295,10 +363,10 @@ class ReactionFactory(DjangoModelFactory):
         else:
             self.comment = extracted or CommentFactory()
 
-class VoteFactory(DjangoModelFactory):
+class VoteFactory(BulkCreateMixin, DjangoModelFactory):
     class Meta:
         model = Vote
 
     user = SubFactory(UserFactory)
     option = SubFactory(PollOptionFactory)
-    voted_at = Faker('date_time_this_year', tzinfo=timezone.utc)
+    voted_at = LazyFunction(_date_time_this_year)
@@ -1,31 +1,47 @@
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 from django.utils import timezone
 
+from .constants import freeze
+
 # Base directory for fixtures
 FIXTURES_DIR = Path(__file__).parent / 'fixtures_data'
 FIXTURES_DIR.mkdir(exist_ok=True)
 
+@lru_cache(maxsize=32)
 def load_fixture(filename: str) -> Dict[str, Any]:
-    """Load fixture data from JSON file."""
+    """Load fixture data from JSON file, parsed once and read-only."""
     filepath = FIXTURES_DIR / filename
-    if not filepath.exists():
-        return {}
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    try:
+        return freeze(orjson.loads(filepath.read_bytes()))
+    except FileNotFoundError:
+        return freeze({})
+
+def _unfreeze(value: Any) -> Any:
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 def save_fixture(filename: str, data: Dict[str, Any]) -> None:
-    """Save fixture data to JSON file."""
+    """Save fixture data to JSON file, leaving it alone if unchanged."""
     filepath = FIXTURES_DIR / filename
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+    blob = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=_unfreeze)
+    if filepath.exists() and filepath.read_bytes() == blob:
+        return
+    filepath.write_bytes(blob)
+    load_fixture.cache_clear()
 
 # User Fixtures
+@lru_cache(maxsize=None)
 def create_user_fixtures() -> Dict[str, Any]:
     """Create user fixtures."""
-    return {
+    now_iso = timezone.now().isoformat()
+    return freeze({
         'regular_user': {
             'username': 'regular_user',
             'email': 'regular@example.com',
@@ -33,7 +49,7 @@ def create_user_fixtures() -> Dict[str, Any]:
             'first_name': 'Regular',
             'last_name': 'User',
             'is_active': True,
-            'date_joined': timezone.now().isoformat(),
+            'date_joined': now_iso,
         },
         'admin_user': {
             'username': 'admin_user',
@@ -44,21 +60,22 @@ def create_user_fixtures() -> Dict[str, Any]:
             'is_staff': True,
             'is_superuser': True,
             'is_active': True,
-            'date_joined': timezone.now().isoformat(),
+            'date_joined': now_iso,
         },
         'inactive_user': {
             'username': 'inactive_user',
             'email': 'inactive@example.com',
             'password': 'testpass123',
             'is_active': False,
-            'date_joined': timezone.now().isoformat(),
+            'date_joined': now_iso,
         },
-    }
+    })
 
 # Status Fixtures
+@lru_cache(maxsize=None)
 def create_status_fixtures() -> Dict[str, Any]:
     """Create status fixtures."""
-    return {
+    return freeze({
         'available': {
             'name': 'Available',
             'code': 'available',
@@ -84,12 +101,13 @@ def create_status_fixtures() -> Dict[str, Any]:
             'priority': 60,
             'is_available': False,
         },
-    }
+    })
 
 # Room Fixtures
+@lru_cache(maxsize=None)
 def create_room_fixtures() -> Dict[str, Any]:
     """Create room fixtures."""
-    return {
+    return freeze({
         'general': {
             'title': 'General',
             'description': 'General discussion room',
@@ -114,7 +132,7 @@ def create_room_fixtures() -> Dict[str, Any]:
             'is_official': False,
             'max_members': 10,
         },
-    }
+    })
 
 # Event Fixtures
 def create_event_fixtures() -> Dict[str, Any]:
@@ -144,9 +162,10 @@ def create_event_fixtures() -> Dict[str, Any]:
     }
 
 # Post Fixtures
+@lru_cache(maxsize=None)
 def create_post_fixtures() -> Dict[str, Any]:
     """Create post fixtures."""
-    return {
+    return freeze({
         'text_post': {
             'content': 'This is a test post',
             'post_type': 'text',
@@ -163,12 +182,13 @@ def create_post_fixtures() -> Dict[str, Any]:
                 'Other',
             ],
         },
-    }
+    })
 
 # Icebreaker Fixtures
+@lru_cache(maxsize=None)
 def create_icebreaker_fixtures() -> Dict[str, Any]:
     """Create icebreaker fixtures."""
-    return {
+    return freeze({
         'categories': {
             'tech': {
                 'name': 'Technology',
@@ -193,12 +213,13 @@ def create_icebreaker_fixtures() -> Dict[str, Any]:
                 'difficulty': 'easy',
             },
         },
-    }
+    })
 
 # Chat Message Fixtures
+@lru_cache(maxsize=None)
 def create_message_fixtures() -> Dict[str, Any]:
     """Create chat message fixtures."""
-    return {
+    return freeze({
         'text_message': {
             'content': 'Hello, everyone!',
             'message_type': 'text',
@@ -207,36 +228,38 @@ def create_message_fixtures() -> Dict[str, Any]:
             'content': 'User joined the room',
             'message_type': 'system',
         },
-    }
+    })
+
+# Fixture builders keyed by fixture name; files are saved as '<name>.json'
+FIXTURE_BUILDERS = {
+    'users': create_user_fixtures,
+    'statuses': create_status_fixtures,
+    'rooms': create_room_fixtures,
+    'events': create_event_fixtures,
+    'posts': create_post_fixtures,
+    'icebreakers': create_icebreaker_fixtures,
+    'messages': create_message_fixtures,
+}
 
 # Create all fixtures
 def create_all_fixtures() -> None:
     """Create all fixtures and save them to files."""
-    fixtures = {
-        'users.json': create_user_fixtures(),
-        'statuses.json': create_status_fixtures(),
-        'rooms.json': create_room_fixtures(),
-        'events.json': create_event_fixtures(),
-        'posts.json': create_post_fixtures(),
-        'icebreakers.json': create_icebreaker_fixtures(),
-        'messages.json': create_message_fixtures(),
-    }
-    
-    for filename, data in fixtures.items():
-        save_fixture(filename, data)
+    def build_and_save(name: str) -> None:
+        save_fixture(f'{name}.json', FIXTURE_BUILDERS[name]())
+
+    # Files are independent, so each worker builds, serializes and writes one
+    with ThreadPoolExecutor(max_workers=len(FIXTURE_BUILDERS)) as executor:
+        list(executor.map(build_and_save, FIXTURE_BUILDERS))
 
 # Load all fixtures
+@lru_cache(maxsize=None)
 def load_all_fixtures() -> Dict[str, Any]:
-    """Load all fixtures from files."""
-    return {
-        'users': load_fixture('users.json'),
-        'statuses': load_fixture('statuses.json'),
-        'rooms': load_fixture('rooms.json'),
-        'events': load_fixture('events.json'),
-        'posts': load_fixture('posts.json'),
-        'icebreakers': load_fixture('icebreakers.json'),
-        'messages': load_fixture('messages.json'),
-    }
+    """Build all fixtures in memory once, without going through the files."""
+    return freeze({name: build() for name, build in FIXTURE_BUILDERS.items()})
+
+def get_fixture(name: str) -> Dict[str, Any]:
+    """Return a single in-memory fixture by name, e.g. 'rooms'."""
+    return load_all_fixtures()[name]
 
 if __name__ == '__main__':
     create_all_fixtures()
@@ -1,75 +1,146 @@
+import atexit
 import functools
-import json
+import io
+import orjson
+import os
+import shutil
+import tempfile
 import time
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager, nullcontext
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Type, Union
+from unittest import SkipTest, skip
 from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
-from django.db import connection, reset_queries
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import connection, connections, reset_queries, transaction
+from django.dispatch import receiver
 from django.test import override_settings
+from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APIClient
 
 User = get_user_model()
 
+@functools.lru_cache(maxsize=512)
+def _cached_reverse(viewname: str, args: tuple, kwargs_items: tuple) -> str:
+    return reverse(viewname, args=args, kwargs=dict(kwargs_items))
+
+def cached_reverse(viewname: str, *args, **kwargs) -> str:
+    """
+    Reverse a URL name, memoizing the result for repeated lookups.
+    """
+    try:
+        return _cached_reverse(viewname, args, tuple(sorted(kwargs.items())))
+    except TypeError:
+        # Unhashable arguments can't be cached
+        return reverse(viewname, args=args, kwargs=kwargs)
+
+@receiver(setting_changed)
+def _clear_reverse_cache(setting, **kwargs):
+    """Drop cached URLs when the URLconf is overridden."""
+    if setting == 'ROOT_URLCONF':
+        _cached_reverse.cache_clear()
+
+_test_db_config = None
+
+def _ensure_test_databases() -> None:
+    """Create the test databases once and destroy them at process exit."""
+    global _test_db_config
+    if _test_db_config is None:
+        from django.test.utils import setup_databases, teardown_databases
+        _test_db_config = setup_databases(verbosity=0, interactive=False)
+        atexit.register(teardown_databases, _test_db_config, verbosity=0)
+
 def with_test_database(func: Callable) -> Callable:
     """
     Decorator to run tests with a test database.
+    The databases are shared by every decorated test; each test's
+    changes are rolled back when it finishes.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        from django.test.utils import setup_databases, teardown_databases
-        old_db_config = setup_databases(verbosity=0, interactive=False)
-        try:
-            return func(*args, **kwargs)
-        finally:
-            teardown_databases(old_db_config, verbosity=0)
+        _ensure_test_databases()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(transaction.atomic(using=alias))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for alias in connections:
+                    transaction.set_rollback(True, using=alias)
     return wrapper
 
+_CELERY_EAGER_SETTINGS = {
+    'CELERY_TASK_ALWAYS_EAGER': True,
+    'CELERY_TASK_EAGER_PROPAGATES': True,
+}
+
+_IN_MEMORY_CHANNEL_SETTINGS = {
+    'CHANNEL_LAYERS': {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    },
+}
+
+def with_test_env(
+    clear_cache: bool = True,
+    celery: bool = False,
+    websocket: bool = False,
+    skip_ci: bool = False
+) -> Callable:
+    """
+    Decorator combining with_test_cache, with_test_celery,
+    with_test_websocket and skip_in_ci into a single wrapper.
+    Usage: @with_test_env(celery=True, websocket=True)
+    """
+    overrides = {}
+    if celery:
+        overrides.update(_CELERY_EAGER_SETTINGS)
+    if websocket:
+        overrides.update(_IN_MEMORY_CHANNEL_SETTINGS)
+
+    def decorator(func: Callable) -> Callable:
+        if skip_ci and os.environ.get('CI'):
+            return skip('Test skipped in CI environment')(func)
+        # Built once and re-entered on each call, as override_settings does
+        # when used as a decorator
+        settings_override = override_settings(**overrides) if overrides else nullcontext()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with settings_override:
+                if not clear_cache:
+                    return func(*args, **kwargs)
+                _clear_cache()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    _clear_cache()
+        return wrapper
+    return decorator
+
 def with_test_cache(func: Callable) -> Callable:
     """
     Decorator to run tests with a test cache.
     """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        cache.clear()
-        try:
-            return func(*args, **kwargs)
-        finally:
-            cache.clear()
-    return wrapper
+    return with_test_env(clear_cache=True)(func)
 
 def with_test_celery(func: Callable) -> Callable:
     """
     Decorator to run tests with Celery in eager mode.
     """
-    @functools.wraps(func)
-    @override_settings(
-        CELERY_TASK_ALWAYS_EAGER=True,
-        CELERY_TASK_EAGER_PROPAGATES=True
-    )
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    return wrapper
+    return with_test_env(clear_cache=False, celery=True)(func)
 
 def with_test_websocket(func: Callable) -> Callable:
     """
     Decorator to run tests with WebSocket support.
     """
-    @functools.wraps(func)
-    @override_settings(
-        CHANNEL_LAYERS={
-            'default': {
-                'BACKEND': 'channels.layers.InMemoryChannelLayer',
-            },
-        }
-    )
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    return wrapper
+    return with_test_env(clear_cache=False, websocket=True)(func)
 
 @contextmanager
 def mock_now(dt: timezone.datetime):
@@ -81,55 +152,66 @@ def mock_now(dt: timezone.datetime):
         yield mock_now
 
 @contextmanager
-def count_queries():
+def count_queries(verbose: bool = False):
     """
     Context manager to count database queries.
-    """
-    reset_queries()
-    yield
-    query_count = len(connection.queries)
-    print(f"Number of queries: {query_count}")
-    for query in connection.queries:
-        print(f"Query: {query['sql']}")
+    Prints a one-line summary; pass verbose=True to also list each query.
+    """
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as context:
+        yield context
+    queries = context.captured_queries
+    total = sum(float(query['time']) for query in queries)
+    print(f"Number of queries: {len(queries)} in {total:.3f}s")
+    if verbose:
+        print("\n".join(f"Query: {query['sql']}" for query in queries))
 
 @contextmanager
 def temporary_media_root():
     """
     Context manager to use a temporary media root.
     """
-    import tempfile
-    import shutil
     temp_dir = tempfile.mkdtemp()
     with override_settings(MEDIA_ROOT=temp_dir):
         yield temp_dir
     shutil.rmtree(temp_dir)
 
-def create_test_image(filename: str = 'test.jpg') -> str:
+@functools.lru_cache(maxsize=8)
+def create_test_image_bytes(size: tuple = (100, 100)) -> bytes:
     """
-    Create a test image file and return its path.
+    Return JPEG bytes for a test image, encoded once per size.
     """
     from PIL import Image
-    import tempfile
-    import os
 
-    image = Image.new('RGB', (100, 100), 'white')
-    tmp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-    image.save(tmp_file)
-    tmp_file.close()
-    
-    return tmp_file.name
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'white').save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+def _write_temp_file(data: bytes, suffix: str = '') -> str:
+    """Write bytes to a new temporary file with unbuffered os.write calls."""
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    except Exception:
+        os.close(fd)
+        os.unlink(path)
+        raise
+    os.close(fd)
+    return path
+
+def create_test_image(filename: str = 'test.jpg') -> str:
+    """
+    Create a test image file and return its path.
+    """
+    return _write_temp_file(create_test_image_bytes(), suffix='.jpg')
 
 def create_test_file(content: bytes = b'test content') -> str:
     """
     Create a test file and return its path.
     """
-    import tempfile
-    
-    tmp_file = tempfile.NamedTemporaryFile(delete=False)
-    tmp_file.write(content)
-    tmp_file.close()
-    
-    return tmp_file.name
+    return _write_temp_file(content)
 
 def get_test_user(
     username: str = 'testuser',
@@ -165,7 +247,15 @@ def json_response(data: Dict[str, Any], status: int = 200) -> str:
     """
     Create a JSON response string.
     """
-    return json.dumps(data)
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def _clear_cache() -> None:
+    """Clear the default cache, skipping the call when a LocMem cache is empty."""
+    from django.core.cache.backends.locmem import LocMemCache
+    backend = caches['default']
+    if isinstance(backend, LocMemCache) and not backend._cache:
+        return
+    backend.clear()
 
 def setup_test_environment() -> None:
     """
@@ -176,7 +266,7 @@ def setup_test_environment() -> None:
     settings.TESTING = True
     
     # Clear caches
-    cache.clear()
+    _clear_cache()
     
     # Reset database
     reset_queries()
@@ -186,10 +276,9 @@ def teardown_test_environment() -> None:
     Tear down the test environment.
     """
     # Clear caches
-    cache.clear()
+    _clear_cache()
     
     # Clear uploaded files
-    import shutil
     shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
 
 def create_test_data() -> Dict[str, Any]:
@@ -202,19 +291,19 @@ def create_test_data() -> Dict[str, Any]:
     )
     
     # Create users
-    users = UserFactory.create_batch(3)
+    users = User.objects.bulk_create(UserFactory.build_batch(3))
     
     # Create rooms
-    rooms = RoomFactory.create_batch(2)
+    rooms = RoomFactory.create_bulk(2, created_by=users[0])
     
     # Create events
-    events = EventFactory.create_batch(2)
+    events = EventFactory.create_bulk(2, created_by=users[0])
     
     # Create posts
-    posts = PostFactory.create_batch(3)
+    posts = PostFactory.create_bulk(3, author=users[1])
     
     # Create messages
-    messages = ChatMessageFactory.create_batch(3)
+    messages = ChatMessageFactory.create_bulk(3, room=rooms[0], sender=users[2])
     
     return {
         'users': users,
@@ -241,29 +330,54 @@ def skip_in_ci(func: Callable) -> Callable:
     """
     Decorator to skip tests in CI environment.
     """
-    import os
-    import unittest
-    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         if os.environ.get('CI'):
-            raise unittest.SkipTest('Test skipped in CI environment')
+            raise SkipTest('Test skipped in CI environment')
         return func(*args, **kwargs)
     return wrapper
 
+@functools.lru_cache(maxsize=1)
+def _redis_available() -> bool:
+    """Ping the local Redis once per process."""
+    try:
+        import redis
+    except ImportError:
+        return False
+    try:
+        redis.Redis(host='localhost', port=6379, db=0).ping()
+    except redis.ConnectionError:
+        return False
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _celery_available() -> bool:
+    """Check once per process that a Celery app can be built."""
+    try:
+        from celery.app.base import Celery
+        app = Celery()
+        app.broker_url = 'memory://'
+    except Exception:
+        return False
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _channels_available() -> bool:
+    """Check once per process that Channels can be imported."""
+    try:
+        import channels
+    except ImportError:
+        return False
+    return True
+
 def requires_redis(func: Callable) -> Callable:
     """
     Decorator to skip tests if Redis is not available.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        import redis
-        try:
-            client = redis.Redis(host='localhost', port=6379, db=0)
-            client.ping()
-        except redis.ConnectionError:
-            import unittest
-            raise unittest.SkipTest('Redis is not available')
+        if not _redis_available():
+            raise SkipTest('Redis is not available')
         return func(*args, **kwargs)
     return wrapper
 
@@ -273,13 +387,8 @@ def requires_celery(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        from celery.app.base import Celery
-        try:
-            app = Celery()
-            app.broker_url = 'memory://'
-        except Exception:
-            import unittest
-            raise unittest.SkipTest('Celery is not available')
+        if not _celery_available():
+            raise SkipTest('Celery is not available')
         return func(*args, **kwargs)
     return wrapper
 
@@ -289,11 +398,8 @@ def requires_websocket(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            import channels
-        except ImportError:
-            import unittest
-            raise unittest.SkipTest('WebSocket support is not available')
+        if not _channels_available():
+            raise SkipTest('WebSocket support is not available')
         return func(*args, **kwargs)
     return wrapper
 
@@ -301,23 +407,11 @@ def load_fixture(filename: str) -> Dict[str, Any]:
     """
     Load test fixture data from a JSON file.
     """
-    import os
-    fixture_path = os.path.join(settings.BASE_DIR, 'tests', 'fixtures', filename)
-    with open(fixture_path, 'r') as f:
-        return json.load(f)
+    fixture_path = Path(settings.BASE_DIR, 'tests', 'fixtures', filename)
+    return orjson.loads(fixture_path.read_bytes())
 
 def create_temp_file(content: str) -> str:
     """
     Create a temporary file with given content.
     """
-    import tempfile
-    import os
-    
-    fd, path = tempfile.mkstemp()
-    try:
-        with os.fdopen(fd, 'w') as tmp:
-            tmp.write(content)
-    except Exception:
-        os.unlink(path)
-        raise
-    return path
+    return _write_temp_file(content.encode())
@@ -6,21 +6,22 @@ Logging configuration for the BreakSphere test suite.
 """
 
 import logging
+import logging.config
 import os
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from .config import TEST_LOG_DIR
 
-# Ensure log directory exists
-TEST_LOG_DIR.mkdir(parents=True, exist_ok=True)
-
 # Log file naming
+# One timestamp per process, so every log of a run shares it
+_PROCESS_TIMESTAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
+
 def get_log_filename(prefix: str = 'test') -> str:
-    """Generate a log filename with timestamp."""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    return f"{prefix}_{timestamp}.log"
+    """Generate a log filename with the process start timestamp."""
+    return f"{prefix}_{_PROCESS_TIMESTAMP}.log"
 
 # Logging formats
 VERBOSE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -62,11 +63,11 @@ class TestLogger(logging.Logger):
 logging.setLoggerClass(TestLogger)
 
 class TestLogHandler(logging.Handler):
-    """Custom handler that maintains a buffer of log records."""
+    """Custom handler that keeps the most recent log records in a buffer."""
     
-    def __init__(self):
+    def __init__(self, capacity: int = 10_000):
         super().__init__()
-        self.buffer = []
+        self.buffer = deque(maxlen=capacity)
 
     def emit(self, record):
         """Store the log record in the buffer."""
@@ -78,7 +79,7 @@ class TestLogHandler(logging.Handler):
 
     def clear(self):
         """Clear the log buffer."""
-        self.buffer = []
+        self.buffer.clear()
 
 class TestFormatter(logging.Formatter):
     """Custom formatter that includes test-specific information."""
@@ -117,6 +118,9 @@ def setup_test_logging(
     if format_string is None:
         format_string = DEBUG_FORMAT
 
+    # The file handler below writes into TEST_LOG_DIR
+    TEST_LOG_DIR.mkdir(parents=True, exist_ok=True)
+
     config = {
         'version': 1,
         'disable_existing_loggers': False,
@@ -143,6 +147,7 @@ def setup_test_logging(
             'file': {
                 'class': 'logging.FileHandler',
                 'filename': str(TEST_LOG_DIR / filename),
+                'delay': True,
                 'formatter': 'verbose',
                 'level': level
             },
@@ -185,11 +190,13 @@ class LogCapture:
         self.handler = TestLogHandler()
         self.logger = logging.getLogger(logger_name)
         self.old_handlers = []
+        self._capture_handlers = [self.handler]
 
     def __enter__(self):
         """Start capturing logs."""
-        self.old_handlers = self.logger.handlers[:]
-        self.logger.handlers = [self.handler]
+        # Swap list references; the original list is untouched until restored
+        self.old_handlers = self.logger.handlers
+        self.logger.handlers = self._capture_handlers
         return self.handler
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -215,10 +222,20 @@ def log_test_result(
             exc_info=error
         )
 
-def configure_test_logging():
-    """Configure logging for the test suite."""
+_configured = False
+
+def configure_test_logging(force: bool = False):
+    """
+    Configure logging for the test suite.
+    Only the first call applies the configuration, so the process keeps a
+    single file handler; pass force=True to rebuild it.
+    """
+    global _configured
+    if _configured and not force:
+        return
     config = setup_test_logging()
     logging.config.dictConfig(config)
+    _configured = True
 
 def clear_test_logs():
     """Clear all test log files."""
@@ -227,6 +244,3 @@ def clear_test_logs():
             file.unlink()
         except OSError:
             pass
-
-# Configure logging when module is imported
-configure_test_logging()
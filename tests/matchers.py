@@ -1,12 +1,19 @@
+import operator
+import re
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Type, Union
 from unittest.mock import Mock
 
-from django.db import models
+from django.db import connection, models
 from django.http import HttpResponse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.response import Response
 
+# Marks a missing attribute or key in a single lookup
+_MISSING = object()
+
 class BaseMatcher:
     """Base class for custom matchers."""
     
@@ -32,7 +39,10 @@ class IsInstanceOf(BaseMatcher):
     """Match if value is instance of expected type."""
     
     def _matches(self) -> bool:
-        return isinstance(self.actual, self.expected)
+        expected = self.expected
+        if type(self.actual) is expected:
+            return True
+        return isinstance(self.actual, expected)
 
     def message_for_failed_match(self) -> str:
         return f"Expected instance of {self.expected.__name__}, got {type(self.actual).__name__}"
@@ -40,13 +50,31 @@ class IsInstanceOf(BaseMatcher):
 class HasAttributes(BaseMatcher):
     """Match if object has expected attributes."""
     
+    def __init__(self, expected: Any):
+        super().__init__(expected)
+        # Fetch every attribute in one call when checking several
+        if len(expected) > 1:
+            self._getter = operator.attrgetter(*expected)
+            self._values = tuple(expected.values())
+        else:
+            self._getter = None
+
     def _matches(self) -> bool:
+        actual = self.actual
+        if self._getter is not None:
+            try:
+                if self._getter(actual) == self._values:
+                    return True
+            except AttributeError:
+                pass
+        # Find the offending attribute for the failure message
         for key, value in self.expected.items():
-            if not hasattr(self.actual, key):
+            actual_value = getattr(actual, key, _MISSING)
+            if actual_value is _MISSING:
                 self.message = f"Object missing attribute '{key}'"
                 return False
-            if getattr(self.actual, key) != value:
-                self.message = f"Attribute '{key}' has value {getattr(self.actual, key)}, expected {value}"
+            if actual_value != value:
+                self.message = f"Attribute '{key}' has value {actual_value}, expected {value}"
                 return False
         return True
 
@@ -54,15 +82,17 @@ class HasDictItems(BaseMatcher):
     """Match if dictionary contains expected items."""
     
     def _matches(self) -> bool:
-        if not isinstance(self.actual, dict):
+        if type(self.actual) is not dict and not isinstance(self.actual, dict):
             self.message = f"Expected dict, got {type(self.actual).__name__}"
             return False
+        actual = self.actual
         for key, value in self.expected.items():
-            if key not in self.actual:
+            actual_value = actual.get(key, _MISSING)
+            if actual_value is _MISSING:
                 self.message = f"Dict missing key '{key}'"
                 return False
-            if self.actual[key] != value:
-                self.message = f"Key '{key}' has value {self.actual[key]}, expected {value}"
+            if actual_value != value:
+                self.message = f"Key '{key}' has value {actual_value}, expected {value}"
                 return False
         return True
 
@@ -151,33 +181,48 @@ class RaisesException(BaseMatcher):
 class MatchesRegex(BaseMatcher):
     """Match if string matches regex pattern."""
     
-    def _matches(self) -> bool:
-        import re
+    def __init__(self, expected: Any):
+        super().__init__(expected)
+        # Compile once; an invalid pattern is reported when matching
         try:
-            return bool(re.match(self.expected, str(self.actual)))
+            self._pattern = re.compile(expected)
+            self._error = None
         except Exception as e:
-            self.message = str(e)
+            self._pattern = None
+            self._error = e
+
+    def _matches(self) -> bool:
+        if self._pattern is None:
+            self.message = str(self._error)
             return False
+        actual = self.actual
+        return self._pattern.match(actual if type(actual) is str else str(actual)) is not None
 
 class IsDatetime(BaseMatcher):
     """Match if value is a datetime within expected range."""
     
     def __init__(self, expected: datetime, delta: timedelta = timedelta(seconds=1)):
         self.delta = delta
+        self._delta_seconds = delta.total_seconds()
         super().__init__(expected)
 
     def _matches(self) -> bool:
-        if not isinstance(self.actual, datetime):
+        if type(self.actual) is not datetime and not isinstance(self.actual, datetime):
             self.message = f"Expected datetime, got {type(self.actual).__name__}"
             return False
         difference = abs((self.actual - self.expected).total_seconds())
-        return difference <= self.delta.total_seconds()
+        return difference <= self._delta_seconds
 
 class HasStatus(BaseMatcher):
     """Match if response has expected status code."""
     
     def _matches(self) -> bool:
-        if not isinstance(self.actual, (HttpResponse, Response)):
+        actual_type = type(self.actual)
+        if (
+            actual_type is not Response
+            and actual_type is not HttpResponse
+            and not isinstance(self.actual, (HttpResponse, Response))
+        ):
             self.message = f"Expected response object, got {type(self.actual).__name__}"
             return False
         return self.actual.status_code == self.expected
@@ -194,11 +239,15 @@ class WasCalled(BaseMatcher):
         return self.actual.call_args == self.expected
 
 class HasQueryCount(BaseMatcher):
-    """Match if number of database queries matches expected count."""
+    """Match if calling the actual callable runs the expected number of queries."""
     
     def _matches(self) -> bool:
-        from django.db import connection
-        query_count = len(connection.queries)
+        if not callable(self.actual):
+            self.message = f"Expected callable, got {type(self.actual).__name__}"
+            return False
+        with CaptureQueriesContext(connection) as context:
+            self.actual()
+        query_count = len(context)
         if query_count != self.expected:
             self.message = f"Expected {self.expected} queries, got {query_count}"
             return False
@@ -223,13 +272,26 @@ class MatchersMixin:
 
     def assert_all(self: TestCase, items: List[Any], matcher: BaseMatcher) -> None:
         """Assert that all items match expected matcher."""
+        matches = matcher.matches
         for item in items:
-            self.assert_that(item, matcher)
+            if not matches(item):
+                self.fail(matcher.message_for_failed_match())
 
     def assert_any(self: TestCase, items: List[Any], matcher: BaseMatcher) -> None:
         """Assert that any item matches expected matcher."""
-        if not any(matcher.matches(item) for item in items):
-            self.fail("No items matched the expected condition")
+        matches = matcher.matches
+        for item in items:
+            if matches(item):
+                return
+        self.fail("No items matched the expected condition")
+
+    @contextmanager
+    def assert_query_count(self: TestCase, expected: int) -> Iterator[CaptureQueriesContext]:
+        """Assert that the block runs the expected number of queries."""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        if len(context) != expected:
+            self.fail(f"Expected {expected} queries, got {len(context)}")
 
 # Matcher factory functions
 def instance_of(expected_type: Type) -> IsInstanceOf:
@@ -5,18 +5,22 @@ Test Metrics Collection and Reporting
 Collect and report various metrics about test execution.
 """
 
+import io
+import sys
 import time
+from array import array
 from collections import defaultdict
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, TextIO, Tuple
 
 from .config import TEST_REPORT_DIR
 from .logging import get_test_logger
 
 logger = get_test_logger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class TestMetric:
     """Base class for test metrics."""
     name: str
@@ -24,58 +28,109 @@ class TestMetric:
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class TestDuration(TestMetric):
     """Metric for test execution duration."""
     pass
 
-@dataclass
+@dataclass(slots=True)
 class TestMemoryUsage(TestMetric):
     """Metric for test memory usage."""
     peak_usage: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseMetrics(TestMetric):
     """Metrics for database operations."""
     query_count: int = 0
     total_time: float = 0.0
     queries: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class CacheMetrics(TestMetric):
     """Metrics for cache operations."""
     hits: int = 0
     misses: int = 0
     total_operations: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
-    """Container for test results and metrics."""
+    """Container for test results and metrics.
+
+    ``start_time`` and ``end_time`` are epoch seconds; use
+    ``start_datetime``/``end_datetime`` for datetime values.
+    """
     test_name: str
     success: bool
     duration: float
-    start_time: datetime
-    end_time: datetime
+    start_time: float
+    end_time: float
     error: Optional[Exception] = None
     skipped: bool = False
     skip_reason: Optional[str] = None
     metrics: Dict[str, TestMetric] = field(default_factory=dict)
 
+    @property
+    def start_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.start_time)
+
+    @property
+    def end_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.end_time)
+
+class _ResultsView(Mapping):
+    """Mapping of test name to TestResult over a collector's result columns."""
+    __slots__ = ('_collector',)
+
+    def __init__(self, collector: 'MetricsCollector'):
+        self._collector = collector
+
+    def __getitem__(self, test_name: str) -> TestResult:
+        return self._collector._build_result(self._collector._result_index[test_name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._collector._result_index)
+
+    def __len__(self) -> int:
+        return len(self._collector._result_index)
+
 class MetricsCollector:
     """Collect and store test metrics."""
     
     def __init__(self):
         self.metrics: Dict[str, List[TestMetric]] = defaultdict(list)
-        self.results: Dict[str, TestResult] = {}
         self.start_time = datetime.now()
         self.end_time: Optional[datetime] = None
         self.current_test: Optional[str] = None
         self._test_timers: Dict[str, float] = {}
-
-    def start_test(self, test_name: str):
-        """Start timing a test."""
+        # Converts perf_counter() readings to epoch seconds
+        self._clock_offset = time.time() - time.perf_counter()
+        # Test durations are kept as raw floats; TestDuration objects are
+        # only built when get_metrics() asks for them
+        self._duration_tests: List[str] = []
+        self._duration_values = array('d')
+        self._duration_ends = array('d')
+        # Latest result per test, stored column-wise; TestResult objects
+        # are built on demand. Errors and skip reasons are sparse.
+        self._result_index: Dict[str, int] = {}
+        self._result_names: List[str] = []
+        self._result_success = array('b')
+        self._result_skipped = array('b')
+        self._result_durations = array('d')
+        self._result_ends = array('d')
+        self._result_errors: Dict[int, Exception] = {}
+        self._result_skip_reasons: Dict[int, str] = {}
+        # Whether names were recorded in sorted order, so reports can skip the sort
+        self._results_sorted = True
+        self._results_view = _ResultsView(self)
+        # Running totals so get_summary() doesn't rescan every result
+        self._passed = self._failed = self._skipped = 0
+        self._total_duration = 0.0
+
+    def start_test(self, test_name: str, started: Optional[float] = None):
+        """Start timing a test, optionally from an earlier perf_counter() reading."""
+        test_name = sys.intern(test_name)
         self.current_test = test_name
-        self._test_timers[test_name] = time.time()
+        self._test_timers[test_name] = time.perf_counter() if started is None else started
 
     def end_test(
         self,
@@ -86,58 +141,125 @@ class MetricsCollector:
         skip_reason: Optional[str] = None
     ):
         """End timing a test and record results."""
+        test_name = sys.intern(test_name)
         if test_name not in self._test_timers:
             logger.warning(f"No start time found for test {test_name}")
             return
 
-        end_time = time.time()
-        duration = end_time - self._test_timers.pop(test_name)
-        
-        self.results[test_name] = TestResult(
-            test_name=test_name,
-            success=success,
+        started = self._test_timers.pop(test_name)
+        finished = time.perf_counter()
+        duration = finished - started
+        end_time = self._clock_offset + finished
+
+        index = self._result_index.get(test_name)
+        if index is None:
+            index = self._result_index[test_name] = len(self._result_names)
+            if index and test_name < self._result_names[-1]:
+                self._results_sorted = False
+            self._result_names.append(test_name)
+            self._result_success.append(success)
+            self._result_skipped.append(skipped)
+            self._result_durations.append(duration)
+            self._result_ends.append(end_time)
+        else:
+            self._count_result(self._result_success[index], self._result_skipped[index], -1)
+            self._result_success[index] = success
+            self._result_skipped[index] = skipped
+            self._result_durations[index] = duration
+            self._result_ends[index] = end_time
+            self._result_errors.pop(index, None)
+            self._result_skip_reasons.pop(index, None)
+        if error is not None:
+            self._result_errors[index] = error
+        if skip_reason is not None:
+            self._result_skip_reasons[index] = skip_reason
+        self._count_result(success, skipped, 1)
+        self._total_duration += duration
+
+        self._duration_tests.append(test_name)
+        self._duration_values.append(duration)
+        self._duration_ends.append(end_time)
+
+    def _count_result(self, success: bool, skipped: bool, step: int):
+        """Add or remove a result from the running totals."""
+        if success:
+            self._passed += step
+        elif not skipped:
+            self._failed += step
+        if skipped:
+            self._skipped += step
+
+    def _build_result(self, index: int) -> TestResult:
+        """Build a TestResult from the stored columns."""
+        duration = self._result_durations[index]
+        end_time = self._result_ends[index]
+        return TestResult(
+            test_name=self._result_names[index],
+            success=bool(self._result_success[index]),
             duration=duration,
-            start_time=datetime.fromtimestamp(end_time - duration),
-            end_time=datetime.fromtimestamp(end_time),
-            error=error,
-            skipped=skipped,
-            skip_reason=skip_reason
+            start_time=end_time - duration,
+            end_time=end_time,
+            error=self._result_errors.get(index),
+            skipped=bool(self._result_skipped[index]),
+            skip_reason=self._result_skip_reasons.get(index),
         )
 
-        self.add_metric(
-            TestDuration(
-                name=f"{test_name}_duration",
-                value=duration
-            )
-        )
+    @property
+    def results(self) -> Mapping[str, TestResult]:
+        """Read-only live view of the latest result per test.
+
+        TestResult objects are built from the stored columns on lookup, so
+        record results through ``end_test`` rather than by assignment.
+        """
+        return self._results_view
 
     def add_metric(self, metric: TestMetric):
         """Add a metric to the collection."""
-        self.metrics[metric.name].append(metric)
+        self.metrics[sys.intern(metric.name)].append(metric)
+
+    def _duration_metrics(self) -> List[TestDuration]:
+        """Build TestDuration metrics from the recorded durations."""
+        return [
+            TestDuration(
+                name=f"{test_name}_duration",
+                value=value,
+                timestamp=datetime.fromtimestamp(end)
+            )
+            for test_name, value, end in zip(
+                self._duration_tests, self._duration_values, self._duration_ends
+            )
+        ]
 
     def get_metrics(self, metric_type: Optional[type] = None) -> List[TestMetric]:
         """Get all metrics of a specific type."""
+        metrics = []
+        if metric_type is None or issubclass(TestDuration, metric_type):
+            metrics.extend(self._duration_metrics())
         if metric_type is None:
-            return [m for metrics in self.metrics.values() for m in metrics]
-        return [
-            m for metrics in self.metrics.values()
-            for m in metrics
-            if isinstance(m, metric_type)
-        ]
+            metrics.extend(m for group in self.metrics.values() for m in group)
+        else:
+            metrics.extend(
+                m for group in self.metrics.values()
+                for m in group
+                if isinstance(m, metric_type)
+            )
+        return metrics
 
     def get_test_result(self, test_name: str) -> Optional[TestResult]:
         """Get the result for a specific test."""
-        return self.results.get(test_name)
+        index = self._result_index.get(test_name)
+        if index is None:
+            return None
+        return self._build_result(index)
 
     def get_summary(self) -> Dict[str, any]:
         """Get a summary of test results and metrics."""
-        total_tests = len(self.results)
-        passed_tests = sum(1 for r in self.results.values() if r.success)
-        failed_tests = sum(1 for r in self.results.values() if not r.success and not r.skipped)
-        skipped_tests = sum(1 for r in self.results.values() if r.skipped)
+        total_tests = len(self._result_names)
+        passed_tests = self._passed
+        failed_tests = self._failed
+        skipped_tests = self._skipped
         
-        durations = self.get_metrics(TestDuration)
-        total_duration = sum(m.value for m in durations)
+        total_duration = self._total_duration
         avg_duration = total_duration / total_tests if total_tests > 0 else 0
         
         return {
@@ -152,62 +274,87 @@ class MetricsCollector:
 
     def generate_report(self) -> str:
         """Generate a detailed report of test results and metrics."""
+        buffer = io.StringIO()
+        self._write_report(buffer)
+        return buffer.getvalue()
+
+    def _write_report(self, out: TextIO):
+        """Write the report to a text stream."""
         summary = self.get_summary()
-        
-        report = [
-            "Test Execution Report",
-            "===================\n",
-            f"Run at: {self.start_time}",
-            f"Duration: {timedelta(seconds=int(summary['total_duration']))}",
-            f"\nResults Summary:",
-            f"  Total Tests: {summary['total_tests']}",
-            f"  Passed: {summary['passed_tests']}",
-            f"  Failed: {summary['failed_tests']}",
-            f"  Skipped: {summary['skipped_tests']}",
-            f"  Success Rate: {summary['success_rate']:.1f}%\n",
-            "Detailed Results:",
+        w = out.write
+
+        w(
+            "Test Execution Report\n"
+            "===================\n\n"
+            f"Run at: {self.start_time}\n"
+            f"Duration: {timedelta(seconds=int(summary['total_duration']))}\n"
+            "\nResults Summary:\n"
+            f"  Total Tests: {summary['total_tests']}\n"
+            f"  Passed: {summary['passed_tests']}\n"
+            f"  Failed: {summary['failed_tests']}\n"
+            f"  Skipped: {summary['skipped_tests']}\n"
+            f"  Success Rate: {summary['success_rate']:.1f}%\n\n"
+            "Detailed Results:\n"
             "----------------"
-        ]
+        )
 
         # Add detailed test results
-        for test_name, result in sorted(self.results.items()):
-            status = "PASSED" if result.success else "SKIPPED" if result.skipped else "FAILED"
-            report.append(
-                f"\n{test_name}:"
+        names = self._result_names
+        errors = self._result_errors
+        skip_reasons = self._result_skip_reasons
+        order = range(len(names))
+        if not self._results_sorted:
+            order = sorted(order, key=names.__getitem__)
+        for index in order:
+            if self._result_success[index]:
+                status = "PASSED"
+            elif self._result_skipped[index]:
+                status = "SKIPPED"
+            else:
+                status = "FAILED"
+            w(
+                f"\n\n{names[index]}:"
                 f"\n  Status: {status}"
-                f"\n  Duration: {result.duration:.3f}s"
+                f"\n  Duration: {self._result_durations[index]:.3f}s"
             )
-            if result.error:
-                report.append(f"  Error: {str(result.error)}")
-            if result.skip_reason:
-                report.append(f"  Skip Reason: {result.skip_reason}")
+            error = errors.get(index)
+            if error:
+                w(f"\n  Error: {str(error)}")
+            skip_reason = skip_reasons.get(index)
+            if skip_reason:
+                w(f"\n  Skip Reason: {skip_reason}")
 
         # Add metrics summary
-        report.extend([
-            "\nMetrics Summary:",
-            "--------------"
-        ])
+        w("\n\nMetrics Summary:\n--------------")
+
+        durations: Dict[str, List[float]] = defaultdict(list)
+        for test_name, value in zip(self._duration_tests, self._duration_values):
+            durations[test_name].append(value)
+        for test_name, values in durations.items():
+            w(
+                f"\n\n{test_name}_duration:"
+                f"\n  Count: {len(values)}"
+                f"\n  Average: {sum(values) / len(values):.3f}"
+            )
 
         for metric_name, metrics in self.metrics.items():
             if metrics:
                 avg_value = sum(m.value for m in metrics) / len(metrics)
-                report.append(
-                    f"\n{metric_name}:"
+                w(
+                    f"\n\n{metric_name}:"
                     f"\n  Count: {len(metrics)}"
                     f"\n  Average: {avg_value:.3f}"
                 )
 
-        return "\n".join(report)
-
     def save_report(self, filename: Optional[str] = None):
         """Save the report to a file."""
         if filename is None:
             filename = f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
         
+        TEST_REPORT_DIR.mkdir(parents=True, exist_ok=True)
         report_path = TEST_REPORT_DIR / filename
-        report_content = self.generate_report()
-        
-        report_path.write_text(report_content)
+        with report_path.open('w') as f:
+            self._write_report(f)
         logger.info(f"Test report saved to {report_path}")
 
 class MetricsContext:
@@ -220,12 +367,13 @@ class MetricsContext:
     ):
         self.collector = collector
         self.test_name = test_name
+        # time.perf_counter() reading taken on __enter__, not a wall-clock time
         self.start_time: Optional[float] = None
 
     def __enter__(self):
         """Start collecting metrics."""
-        self.start_time = time.time()
-        self.collector.start_test(self.test_name)
+        self.start_time = time.perf_counter()
+        self.collector.start_test(self.test_name, self.start_time)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
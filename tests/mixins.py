@@ -6,15 +6,15 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import models
 from django.http import HttpResponse
 from django.test import Client, TestCase
-from django.urls import reverse
 from rest_framework.test import APIClient, APITestCase
 from channels.testing import WebsocketCommunicator
 
 from .assertions import CustomAssertionsMixin
 from .constants import TEST_USER_DATA
 from .helpers import (
+    cached_reverse,
     create_test_file,
-    create_test_image,
+    create_test_image_bytes,
     get_auth_client,
     get_test_user,
 )
@@ -120,22 +120,40 @@ class WebSocketTestMixin:
 class CeleryTestMixin:
     """Mixin for Celery test functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._patch_celery()
+
     def setUp(self):
         super().setUp()
         self.celery_patches = []
-        self._patch_celery()
+        self._task_mocks: Dict[str, MagicMock] = {}
 
     def tearDown(self):
         super().tearDown()
         for patch in self.celery_patches:
             patch.stop()
 
-    def _patch_celery(self):
+    @classmethod
+    def _patch_celery(cls):
         """Patch Celery task execution."""
         from celery import current_app
         current_app.conf.CELERY_ALWAYS_EAGER = True
         current_app.conf.CELERY_EAGER_PROPAGATES_EXCEPTIONS = True
 
+    def _get_task_mock(self, task_name: str) -> MagicMock:
+        """Patch a task's delay once per test and return its mock."""
+        mock = self._task_mocks.get(task_name)
+        if mock is None:
+            mock = self._task_mocks[task_name] = MagicMock()
+            patcher = patch(f'breaksphere.tasks.{task_name}.delay', mock)
+            self.celery_patches.append(patcher)
+            patcher.start()
+        else:
+            mock.reset_mock()
+        return mock
+
     def assert_task_called(
         self,
         task_name: str,
@@ -143,11 +161,8 @@ class CeleryTestMixin:
         **kwargs
     ) -> None:
         """Assert that a Celery task was called."""
-        mock = MagicMock()
-        patch_path = f'breaksphere.tasks.{task_name}.delay'
-        patcher = patch(patch_path, mock)
-        self.celery_patches.append(patcher)
-        patcher.start()
+        from celery import current_app
+        mock = self._get_task_mock(task_name)
         
         # Call the task
         task = current_app.tasks[task_name]
@@ -174,13 +189,29 @@ class CacheTestMixin:
         value: Any,
         timeout: Optional[int] = None
     ) -> None:
-        """Assert that a value is cached."""
+        """
+        Assert that a value is cached.
+
+        With a timeout, also assert that the key expires. For the in-process
+        LocMemCache the clock is moved past the timeout; other backends
+        (Redis, memcached) enforce expiry on the server, so this waits out
+        the timeout for real.
+        """
         cached_value = self.cache.get(key)
         self.assertEqual(cached_value, value)
         if timeout:
-            import time
-            time.sleep(timeout + 1)
-            self.assertIsNone(self.cache.get(key))
+            from django.core.cache import caches
+            from django.core.cache.backends.locmem import LocMemCache
+            if isinstance(caches['default'], LocMemCache):
+                # Move the clock past the timeout instead of sleeping through it
+                from freezegun import freeze_time
+                with freeze_time() as frozen:
+                    frozen.tick(timeout + 1)
+                    self.assertIsNone(self.cache.get(key))
+            else:
+                import time
+                time.sleep(timeout + 1)
+                self.assertIsNone(self.cache.get(key))
 
 class FileTestMixin:
     """Mixin for file-related test functionality."""
@@ -199,13 +230,11 @@ class FileTestMixin:
         size: tuple = (100, 100)
     ) -> SimpleUploadedFile:
         """Create a test image."""
-        path = create_test_image()
-        with open(path, 'rb') as f:
-            return SimpleUploadedFile(
-                name,
-                f.read(),
-                content_type='image/jpeg'
-            )
+        return SimpleUploadedFile(
+            name,
+            create_test_image_bytes(size),
+            content_type='image/jpeg'
+        )
 
 class DatabaseTestMixin:
     """Mixin for database test functionality."""
@@ -247,7 +276,7 @@ class ViewTestMixin:
         **kwargs
     ) -> str:
         """Get a URL by name."""
-        return reverse(viewname, args=args, kwargs=kwargs)
+        return cached_reverse(viewname, *args, **kwargs)
 
     def get_view_response(
         self,
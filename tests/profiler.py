@@ -5,18 +5,23 @@ Test Profiler
 Profile test execution for performance analysis.
 """
 
-import cProfile
+import atexit
+import contextvars
 import functools
 import io
-import line_profiler
-import memory_profiler
+import itertools
+import orjson
 import os
-import pstats
+import random
+import sys
+import threading
 import time
+import tracemalloc
+from collections import deque
 from contextlib import contextmanager
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 
-from django.db import connection, reset_queries
+from django.db import connection
 from django.test import TestCase
 
 from .config import TEST_OUTPUT_DIR
@@ -24,36 +29,93 @@ from .logging import get_test_logger
 
 logger = get_test_logger(__name__)
 
+# One JSON row per saved profile, read by get_slow_tests/analyze_test_performance
+PROFILE_INDEX = TEST_OUTPUT_DIR / 'profiles' / 'index.jsonl'
+
+# Index rows waiting to be written; flushed in one append at exit
+_index_buffer: List[bytes] = []
+_index_lock = threading.Lock()
+
+def flush_profile_index():
+    """Append buffered profile rows to the index file."""
+    with _index_lock:
+        if not _index_buffer:
+            return
+        data = b''.join(_index_buffer)
+        _index_buffer.clear()
+    PROFILE_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    with open(PROFILE_INDEX, 'ab') as f:
+        f.write(data)
+
+atexit.register(flush_profile_index)
+
+PROFILE_HEADER = (
+    "Test Profile Results\n"
+    "===================\n"
+    "Test: {label}\n"
+    "Duration: {duration:.3f}s\n"
+    "Database Queries: {query_count}\n"
+    "Query Time: {query_time:.3f}s\n"
+    "Memory Peak: {memory_peak:.2f} MB\n"
+    "Memory Average: {memory_average:.2f} MB\n"
+)
+
+def _sampling_profiler():
+    """Create a pyinstrument sampler; imported only when profiling runs."""
+    import pyinstrument
+    return pyinstrument.Profiler(
+        interval=float(os.getenv('TEST_PROFILE_INTERVAL', '0.01')),
+        async_mode='disabled',
+    )
+
 class TestProfiler:
     """Profile test execution and collect performance metrics."""
     
     def __init__(self, test_case: TestCase):
         self.test_case = test_case
-        self.profiler = cProfile.Profile()
-        self.line_profiler = line_profiler.LineProfiler()
-        self.query_count = 0
-        self.query_time = 0.0
+        test_class = type(test_case).__name__
+        self.label = f"{test_class}.{test_case._testMethodName}"
+        self._default_filename = f"{test_class}_{test_case._testMethodName}_profile.txt"
+        # Statistical sampling keeps the overhead proportional to wall time
+        # rather than to the number of Python calls
+        self.profiler = _sampling_profiler()
+        self.line_profiler = None
+        if os.getenv('TEST_LINE_PROFILE') == '1':
+            import line_profiler
+            self.line_profiler = line_profiler.LineProfiler()
+        # Counts queries only, unless profile_queries asks it to keep them
+        self.query_log = _QueryLog(limit=0)
         self.start_time = 0.0
         self.end_time = 0.0
         self.memory_usage = []
+        self._query_wrapper = None
+
+    @property
+    def query_count(self) -> int:
+        return self.query_log.count
+
+    @property
+    def query_time(self) -> float:
+        return self.query_log.time
 
     def start(self):
         """Start profiling."""
-        self.start_time = time.time()
-        reset_queries()
-        self.profiler.enable()
-        self.line_profiler.enable()
+        self.start_time = time.perf_counter()
+        self.query_log = _QueryLog(limit=0)
+        self._query_wrapper = connection.execute_wrapper(self.query_log)
+        self._query_wrapper.__enter__()
+        self.profiler.start()
+        if self.line_profiler is not None:
+            self.line_profiler.enable()
 
     def stop(self):
         """Stop profiling."""
-        self.line_profiler.disable()
-        self.profiler.disable()
-        self.end_time = time.time()
-        self.query_count = len(connection.queries)
-        self.query_time = sum(
-            float(query.get('time', 0))
-            for query in connection.queries
-        )
+        if self.line_profiler is not None:
+            self.line_profiler.disable()
+        self.profiler.stop()
+        self.end_time = time.perf_counter()
+        self._query_wrapper.__exit__(None, None, None)
+        self._query_wrapper = None
 
     def get_stats(self) -> Dict[str, Any]:
         """Get profiling statistics."""
@@ -70,180 +132,263 @@ class TestProfiler:
 
     def print_stats(self):
         """Print profiling statistics."""
-        stats = self.get_stats()
-        
-        print("\nTest Profile Results")
-        print("===================")
-        print(f"Test: {self.test_case.__class__.__name__}.{self.test_case._testMethodName}")
-        print(f"Duration: {stats['duration']:.3f}s")
-        print(f"Database Queries: {stats['query_count']}")
-        print(f"Query Time: {stats['query_time']:.3f}s")
-        print(f"Memory Peak: {stats['memory_peak']:.2f} MB")
-        print(f"Memory Average: {stats['memory_average']:.2f} MB")
-        
-        # Print detailed profiling information
-        s = io.StringIO()
-        ps = pstats.Stats(self.profiler, stream=s).sort_stats('cumulative')
-        ps.print_stats()
-        print("\nDetailed Profile:")
-        print(s.getvalue())
+        header = PROFILE_HEADER.format(label=self.label, **self.get_stats())
+        print(f"\n{header}\nDetailed Profile:\n{self.profiler.output_text()}")
 
     def save_stats(self, filename: Optional[str] = None):
         """Save profiling statistics to a file."""
         if filename is None:
-            filename = (
-                f"{self.test_case.__class__.__name__}"
-                f"_{self.test_case._testMethodName}"
-                "_profile.txt"
-            )
+            filename = self._default_filename
         
         output_path = TEST_OUTPUT_DIR / 'profiles' / filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        stats = self.get_stats()
         
+        header = PROFILE_HEADER.format(label=self.label, **stats)
         with open(output_path, 'w') as f:
-            stats = self.get_stats()
-            
-            f.write("Test Profile Results\n")
-            f.write("===================\n")
-            f.write(f"Test: {self.test_case.__class__.__name__}.{self.test_case._testMethodName}\n")
-            f.write(f"Duration: {stats['duration']:.3f}s\n")
-            f.write(f"Database Queries: {stats['query_count']}\n")
-            f.write(f"Query Time: {stats['query_time']:.3f}s\n")
-            f.write(f"Memory Peak: {stats['memory_peak']:.2f} MB\n")
-            f.write(f"Memory Average: {stats['memory_average']:.2f} MB\n\n")
-            
-            # Write detailed profiling information
-            s = io.StringIO()
-            ps = pstats.Stats(self.profiler, stream=s).sort_stats('cumulative')
-            ps.print_stats()
-            f.write("Detailed Profile:\n")
-            f.write(s.getvalue())
+            f.write(f"{header}\nDetailed Profile:\n{self.profiler.output_text()}")
+
+        name = output_path.stem
+        if name.endswith('_profile'):
+            name = name[:-8]
+        row = {
+            'name': name,
+            'duration': stats['duration'],
+            'queries': stats['query_count'],
+            'peak': stats['memory_peak'],
+            'avg': stats['memory_average'],
+        }
+        with _index_lock:
+            _index_buffer.append(orjson.dumps(row) + b'\n')
+
+_profile_counter = itertools.count(1)
+
+def _should_profile(test_case: TestCase) -> bool:
+    """
+    Decide whether to profile a test.
+
+    TEST_PROFILE_EVERY_N profiles every Nth test; otherwise
+    TEST_PROFILE_SAMPLE_RATE profiles that fraction of tests, chosen
+    deterministically from the test id. Both default to off.
+    """
+    every_n = int(os.getenv('TEST_PROFILE_EVERY_N', '0'))
+    if every_n > 0:
+        return next(_profile_counter) % every_n == 0
+    rate = float(os.getenv('TEST_PROFILE_SAMPLE_RATE', '0'))
+    return rate > 0 and random.Random(test_case.id()).random() < rate
+
+# The profiler running for the current test; stacked profiling decorators
+# add to it instead of starting their own
+_active_profiler: contextvars.ContextVar[Optional[TestProfiler]] = (
+    contextvars.ContextVar('active_profiler', default=None)
+)
+
+def get_active_profiler() -> Optional[TestProfiler]:
+    """Return the profiler running for the current test, if any."""
+    return _active_profiler.get()
+
+@contextmanager
+def _profiling(test_case: TestCase):
+    """Profile a test, reusing the active profiler when already inside one."""
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        yield profiler
+        return
+    profiler = TestProfiler(test_case)
+    token = _active_profiler.set(profiler)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active_profiler.reset(token)
+        profiler.save_stats()
 
 class ProfiledTestCase(TestCase):
-    """Base test case with profiling capabilities."""
+    """Base test case that profiles a sampled subset of its tests."""
     
     def setUp(self):
         super().setUp()
-        self.profiler = TestProfiler(self)
-        self.profiler.start()
+        self._profiled = _should_profile(self)
+        if self._profiled:
+            self.profiler = TestProfiler(self)
+            self._profiler_token = _active_profiler.set(self.profiler)
+            self.profiler.start()
 
     def tearDown(self):
-        self.profiler.stop()
-        self.profiler.save_stats()
+        if self._profiled:
+            self.profiler.stop()
+            _active_profiler.reset(self._profiler_token)
+            self.profiler.save_stats()
         super().tearDown()
 
 def profile_test(test_func: Callable) -> Callable:
     """Decorator to profile a test method."""
     @functools.wraps(test_func)
     def wrapper(self, *args, **kwargs):
-        profiler = TestProfiler(self)
-        profiler.start()
-        try:
-            result = test_func(self, *args, **kwargs)
-            return result
-        finally:
-            profiler.stop()
-            profiler.save_stats()
+        with _profiling(self):
+            return test_func(self, *args, **kwargs)
     return wrapper
 
 def profile_memory(test_func: Callable) -> Callable:
     """Decorator to profile memory usage of a test method."""
     @functools.wraps(test_func)
     def wrapper(self, *args, **kwargs):
-        @memory_profiler.profile
-        def profiled_func():
+        # Only start/stop snapshots are taken, so the test runs untraced by line
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
             return test_func(self, *args, **kwargs)
-        return profiled_func()
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            top_stats = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            if not already_tracing:
+                tracemalloc.stop()
+            logger.info(
+                f"{test_func.__name__} memory: current={current / 1024:.1f} KiB, "
+                f"peak={peak / 1024:.1f} KiB"
+            )
+            for stat in top_stats:
+                logger.info(f"  {stat}")
+            profiler = _active_profiler.get()
+            if profiler is not None:
+                profiler.memory_usage.append(peak / (1024 * 1024))
     return wrapper
 
+# Only the most recent queries are kept, with their SQL truncated
+MAX_LOGGED_QUERIES = int(os.getenv('TEST_QUERY_LOG_LIMIT', '1000'))
+MAX_LOGGED_SQL = 200
+
+class _QueryLog:
+    """Execute wrapper that keeps a bounded log of (time, sql) pairs."""
+
+    def __init__(self, limit: int = MAX_LOGGED_QUERIES):
+        self.count = 0
+        self.time = 0.0
+        self.queries = deque(maxlen=limit)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.time += elapsed
+            if self.queries.maxlen:
+                self.queries.append((elapsed, sql[:MAX_LOGGED_SQL]))
+
+    def keep_queries(self, limit: int = MAX_LOGGED_QUERIES):
+        """Start keeping the most recent queries if only counting so far."""
+        if not self.queries.maxlen:
+            self.queries = deque(maxlen=limit)
+
+    def write(self, since: int = 0):
+        """Write the queries logged after the first ``since`` to stdout in one call."""
+        count = self.count - since
+        kept = list(self.queries)[-count:] if count else []
+        buffer = io.StringIO()
+        buffer.write(f"\nDatabase Queries ({count}):\n")
+        first = count - len(kept) + 1
+        for i, (elapsed, sql) in enumerate(kept, first):
+            buffer.write(f"\n{i}. Time: {elapsed:.3f}s\n   SQL: {sql}\n")
+        sys.stdout.write(buffer.getvalue())
+
 def profile_queries(test_func: Callable) -> Callable:
     """Decorator to profile database queries in a test method."""
     @functools.wraps(test_func)
     def wrapper(self, *args, **kwargs):
-        reset_queries()
-        result = test_func(self, *args, **kwargs)
-        queries = connection.queries
-        print(f"\nDatabase Queries ({len(queries)}):")
-        for i, query in enumerate(queries, 1):
-            print(f"\n{i}. Time: {query['time']}s")
-            print(f"   SQL: {query['sql']}")
+        profiler = _active_profiler.get()
+        if profiler is not None:
+            # Reuse the running profiler's execute wrapper
+            log = profiler.query_log
+            log.keep_queries()
+            # Report only this call's queries, not those since setUp
+            since = log.count
+            result = test_func(self, *args, **kwargs)
+        else:
+            log = _QueryLog()
+            since = 0
+            with connection.execute_wrapper(log):
+                result = test_func(self, *args, **kwargs)
+        log.write(since)
         return result
     return wrapper
 
 @contextmanager
 def profile_block(name: str):
     """Context manager to profile a block of code."""
-    profiler = cProfile.Profile()
+    profiler = _sampling_profiler()
     print(f"\nStarting profile block: {name}")
-    profiler.enable()
-    start_time = time.time()
-    reset_queries()
+    profiler.start()
+    start_time = time.perf_counter()
+    # Count only; no SQL is kept for the block
+    log = _QueryLog(limit=0)
     
     try:
-        yield
+        with connection.execute_wrapper(log):
+            yield
     finally:
-        end_time = time.time()
-        profiler.disable()
+        end_time = time.perf_counter()
+        profiler.stop()
         duration = end_time - start_time
-        query_count = len(connection.queries)
+        query_count = log.count
         
         print(f"\nProfile block results: {name}")
         print(f"Duration: {duration:.3f}s")
         print(f"Queries: {query_count}")
         
-        s = io.StringIO()
-        ps = pstats.Stats(profiler, stream=s).sort_stats('cumulative')
-        ps.print_stats()
-        print(s.getvalue())
+        print(profiler.output_text())
 
 @contextmanager
 def track_queries():
     """Context manager to track database queries."""
-    reset_queries()
+    log = _QueryLog()
     try:
-        yield
+        with connection.execute_wrapper(log):
+            yield
     finally:
-        queries = connection.queries
-        print(f"\nDatabase Queries ({len(queries)}):")
-        for i, query in enumerate(queries, 1):
-            print(f"\n{i}. Time: {query['time']}s")
-            print(f"   SQL: {query['sql']}")
+        log.write()
 
 @contextmanager
 def track_time(name: str):
     """Context manager to track execution time."""
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         yield
     finally:
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         print(f"\n{name} took {duration:.3f}s")
 
+def _load_profile_index() -> Dict[str, Dict[str, Any]]:
+    """Read the profile index, keeping the latest row for each test."""
+    flush_profile_index()
+    try:
+        lines = PROFILE_INDEX.read_bytes().splitlines()
+    except FileNotFoundError:
+        return {}
+    rows = {}
+    for line in lines:
+        if line:
+            row = orjson.loads(line)
+            rows[row['name']] = row
+    return rows
+
 def get_slow_tests(threshold: float = 1.0) -> List[str]:
     """Get a list of tests that took longer than the threshold."""
-    slow_tests = []
-    profile_dir = TEST_OUTPUT_DIR / 'profiles'
-    
-    if not profile_dir.exists():
-        return slow_tests
-    
-    for profile_file in profile_dir.glob('*_profile.txt'):
-        with open(profile_file) as f:
-            for line in f:
-                if line.startswith('Duration:'):
-                    duration = float(line.split(':')[1].strip()[:-1])
-                    if duration > threshold:
-                        slow_tests.append(profile_file.stem[:-8])  # Remove '_profile'
-                    break
-    
-    return sorted(slow_tests)
+    return sorted(
+        name for name, row in _load_profile_index().items()
+        if row['duration'] > threshold
+    )
 
 def analyze_test_performance(test_pattern: Optional[str] = None):
     """Analyze test performance metrics."""
-    profile_dir = TEST_OUTPUT_DIR / 'profiles'
+    rows = _load_profile_index()
     
-    if not profile_dir.exists():
+    if not rows:
         print("No profile data found.")
         return
     
@@ -252,25 +397,15 @@ def analyze_test_performance(test_pattern: Optional[str] = None):
     test_count = 0
     slowest_tests = []
     
-    for profile_file in profile_dir.glob('*_profile.txt'):
-        if test_pattern and test_pattern not in profile_file.name:
+    for test_name, row in rows.items():
+        if test_pattern and test_pattern not in test_name:
             continue
-            
-        with open(profile_file) as f:
-            test_name = profile_file.stem[:-8]  # Remove '_profile'
-            duration = 0
-            queries = 0
-            
-            for line in f:
-                if line.startswith('Duration:'):
-                    duration = float(line.split(':')[1].strip()[:-1])
-                    total_duration += duration
-                elif line.startswith('Database Queries:'):
-                    queries = int(line.split(':')[1].strip())
-                    total_queries += queries
-            
-            test_count += 1
-            slowest_tests.append((test_name, duration, queries))
+        duration = row['duration']
+        queries = row['queries']
+        total_duration += duration
+        total_queries += queries
+        test_count += 1
+        slowest_tests.append((test_name, duration, queries))
     
     if test_count == 0:
         print("No matching tests found.")
@@ -1,6 +1,6 @@
+import base64
 import json
 import random
-import string
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Type, Union
 from unittest.mock import MagicMock, patch
@@ -17,28 +17,32 @@ from faker import Faker
 User = get_user_model()
 fake = Faker()
 
-class TestDataMixin:
-    """Mixin providing methods for generating test data."""
-    
-    @staticmethod
-    def generate_string(length: int = 10) -> str:
-        """Generate a random string of given length."""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+def generate_string(length: int = 10) -> str:
+    """Generate a random lowercase alphanumeric string of given length."""
+    # Base32-encode random bits in one call instead of picking each character
+    size = (length * 5 + 7) // 8
+    data = random.getrandbits(size * 8).to_bytes(size, 'big')
+    return base64.b32encode(data).decode('ascii')[:length].lower()
 
-    @staticmethod
-    def generate_email() -> str:
-        """Generate a random email address."""
-        return f"{TestDataMixin.generate_string()}@example.com"
+def generate_email() -> str:
+    """Generate a random email address."""
+    return f"{generate_string()}@example.com"
 
-    @staticmethod
-    def generate_phone() -> str:
-        """Generate a random phone number."""
-        return f"+1{random.randint(1000000000, 9999999999)}"
+def generate_phone() -> str:
+    """Generate a random phone number."""
+    return f"+1{random.randrange(1000000000, 10000000000)}"
 
-    @staticmethod
-    def generate_url() -> str:
-        """Generate a random URL."""
-        return f"https://example.com/{TestDataMixin.generate_string()}"
+def generate_url() -> str:
+    """Generate a random URL."""
+    return f"https://example.com/{generate_string()}"
+
+class TestDataMixin:
+    """Mixin providing methods for generating test data."""
+    
+    generate_string = staticmethod(generate_string)
+    generate_email = staticmethod(generate_email)
+    generate_phone = staticmethod(generate_phone)
+    generate_url = staticmethod(generate_url)
 
     @staticmethod
     def generate_datetime(
@@ -59,7 +63,7 @@ class TestDataMixin:
     ) -> SimpleUploadedFile:
         """Generate a file for testing uploads."""
         if name is None:
-            name = f"test_file_{TestDataMixin.generate_string()}.txt"
+            name = f"test_file_{generate_string()}.txt"
         if content is None:
             content = b"Test file content"
         return SimpleUploadedFile(name, content, content_type)
@@ -114,14 +118,15 @@ class DatabaseTestMixin:
     @staticmethod
     def count_queries(func):
         """Decorator to count database queries."""
-        from django.db import connection, reset_queries
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
         from functools import wraps
         
         @wraps(func)
         def wrapper(*args, **kwargs):
-            reset_queries()
-            result = func(*args, **kwargs)
-            query_count = len(connection.queries)
+            with CaptureQueriesContext(connection) as context:
+                result = func(*args, **kwargs)
+            query_count = len(context)
             print(f"Function {func.__name__} made {query_count} queries")
             return result
         return wrapper